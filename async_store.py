@@ -0,0 +1,81 @@
+import asyncio
+import concurrent.futures
+import threading
+
+from firebase_admin import firestore_async
+
+
+class Pending:
+    """Dict-like view of a future's {key: value} result; only blocks when a key is first looked up."""
+
+    def __init__(self, future):
+        self.future = future
+
+    def get(self, key, default=None):
+        return self.future.result().get(key, default)
+
+
+class AsyncFirestore:
+    """
+    A firestore.AsyncClient driven by an event loop on its own thread.
+    Pipeline threads hand it coroutines and get concurrent futures back,
+    so Firestore round-trips overlap each other and the scraping instead
+    of holding a worker for their whole duration.
+    """
+
+    def __init__(self, meter=None):
+        self.meter = meter
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="firestore-async", daemon=True)
+        self._thread.start()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.db = self.run(self._make_client())
+
+    async def _make_client(self):
+        # Created on the loop so its channel belongs to it
+        return firestore_async.client()
+
+    def submit(self, coro):
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def run(self, coro):
+        """Runs `coro` on the loop and waits for it."""
+        return self.submit(coro).result()
+
+    async def get_all(self, paths):
+        snaps = [snap async for snap in self.db.get_all([self.db.document(p) for p in paths])]
+        if self.meter:
+            self.meter.add_reads(len(snaps))
+        return snaps
+
+    async def stream(self, query):
+        docs = [doc.to_dict() async for doc in query.stream()]
+        if self.meter:
+            self.meter.add_reads(max(1, len(docs)))
+        return docs
+
+    async def commit(self, writes):
+        """Applies [(path, data, merge)] in one atomic batch."""
+        batch = self.db.batch()
+        for path, data, merge in writes:
+            batch.set(self.db.document(path), data, merge=merge)
+        await batch.commit()
+        if self.meter:
+            self.meter.add_writes(len(writes))
+
+    def close(self):
+        """Waits for everything still in flight, then stops the loop."""
+        with self._lock:
+            pending = list(self._pending)
+        concurrent.futures.wait(pending)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
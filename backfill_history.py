@@ -0,0 +1,182 @@
+import argparse
+import os
+
+import firebase_admin
+import pandas as pd
+from firebase_admin import credentials, firestore
+
+from history_store import DAILY_COLLECTION, MONTHLY_COLLECTION, HISTORY_FIELDS, bump_data_version, fold_month, month_of
+from pipeline import Pipeline, Stage
+from team_daily import INCREASE_FIELDS, SOLVED_FIELDS, TEAM_COLLECTION
+
+# Users whose history is streamed concurrently
+BACKFILL_WORKERS = int(os.getenv("BACKFILL_WORKERS", "8"))
+
+PLATFORM_OF = {
+    'leetcode_total': 'leetcode',
+    'skillrack_total': 'skillrack',
+    'codechef_total': 'codechef',
+    'hackerrank_total': 'hackerrank',
+    'github_repos': 'github',
+}
+
+
+def load_user_rows(user_ref):
+    """Every raw daily_totals document of one user (compacted months included; compaction keeps them)."""
+    rows = []
+    for doc in user_ref.collection(DAILY_COLLECTION).stream():
+        data = doc.to_dict() or {}
+        rows.append({**data, 'user': user_ref.id, 'doc_id': doc.id, 'date': data.get('date') or doc.id})
+    return rows
+
+
+def recompute(stored):
+    """
+    Clean totals and increases for every user at once. A total that drops to
+    0 between two positive ones is a failed scrape, so the last known value
+    is carried forward; a drop to 0 that never recovers is real (the profile
+    was removed or no longer exists) and is kept. Each increase is then the
+    change since the user's previous recorded day (0 on their first),
+    whatever days are missing.
+    """
+    stored = stored.sort_values(['user', 'date']).reset_index(drop=True)
+    fixed = stored[['user', 'doc_id', 'date']].copy()
+    dips = {}
+    for total_field, increase_field in INCREASE_FIELDS.items():
+        raw = pd.to_numeric(stored.get(total_field, pd.Series(0, index=stored.index)), errors='coerce').fillna(0)
+        known = raw.where(raw > 0).groupby(stored['user'])
+        last_known, next_known = known.ffill(), known.bfill()
+        dips[total_field] = (raw == 0) & last_known.notna() & next_known.notna()
+        total = raw.mask(dips[total_field], last_known).astype(int)
+        fixed[total_field] = total
+        fixed[increase_field] = total.groupby(stored['user']).diff().fillna(0).astype(int)
+    return stored, fixed, pd.DataFrame(dips)
+
+
+def corrections(stored, fixed, dips):
+    """{row position: {field: new value}} for every stored field that differs from the recomputed one."""
+    changes = {}
+    for field in HISTORY_FIELDS:
+        # A missing field reads as 0 everywhere, so it only needs writing if the clean value isn't 0
+        old = pd.to_numeric(stored.get(field, pd.Series(index=stored.index, dtype=float)), errors='coerce')
+        differs = old.fillna(0).ne(fixed[field])
+        for pos in differs[differs].index:
+            changes.setdefault(pos, {})[field] = int(fixed.at[pos, field])
+    for total_field, dipped in dips.items():
+        for pos in dipped[dipped].index:
+            changes.setdefault(pos, {})['carried_forward'] = firestore.ArrayUnion([PLATFORM_OF[total_field]])
+    return changes
+
+
+def latest_pointers(fixed, changes):
+    """
+    users/{user} pointer fields for every user whose last two days were
+    corrected, since the scraper diffs its next day against them.
+    """
+    pointers = {}
+    for user, positions in fixed.groupby('user').indices.items():
+        if not any(pos in changes for pos in positions[-2:]):
+            continue
+        totals = [{field: int(fixed.at[pos, field]) for field in INCREASE_FIELDS} for pos in positions[-2:]]
+        pointers[user] = {
+            'latest_date': fixed.at[positions[-1], 'date'],
+            'latest_totals': totals[-1],
+            'baseline_totals': totals[0] if len(totals) > 1 else None,
+        }
+    return pointers
+
+
+def team_series(fixed):
+    """team_daily documents rebuilt from every user's clean history, one per date."""
+    increase_cols = list(INCREASE_FIELDS.values())
+    team = (fixed.assign(members=1, active_members=(fixed[increase_cols] > 0).any(axis=1).astype(int))
+                 .groupby('date')[list(INCREASE_FIELDS) + increase_cols + ['members', 'active_members']]
+                 .sum())
+    team['total_solved'] = team[SOLVED_FIELDS].sum(axis=1)
+    team['total_daily_increase'] = team[[INCREASE_FIELDS[f] for f in SOLVED_FIELDS]].sum(axis=1)
+    return {day: {'date': day, **{k: int(v) for k, v in row.items()}} for day, row in team.iterrows()}
+
+
+def backfill(db, first_user=None, last_user=None, dry_run=False):
+    user_refs = [ref for ref in db.collection('users').list_documents()
+                 if (first_user is None or ref.id >= first_user) and (last_user is None or ref.id <= last_user)]
+    whole_team = first_user is None and last_user is None
+    if not user_refs:
+        print("✅ No users in range.")
+        return
+
+    load = Stage("load", load_user_rows, workers=BACKFILL_WORKERS)
+    pipeline = Pipeline([load])
+    rows = [row for user_rows in pipeline.run(user_refs) for row in user_rows]
+    pipeline.report()
+    if load.failed:
+        # Team days summed without those users would undercount them, so team_daily is left alone
+        print(f"⚠ History failed to load for {load.failed} users; only the loaded users will be corrected.")
+    if not rows:
+        print("✅ No history to backfill.")
+        return
+
+    stored, fixed, dips = recompute(pd.DataFrame(rows))
+    changes = corrections(stored, fixed, dips)
+    pointers = latest_pointers(fixed, changes)
+
+    # Compacted months are what the dashboards read, so they are re-folded from the clean rows
+    markers = {snap.id: (snap.to_dict() or {}).get('compacted_through')
+               for snap in db.get_all(user_refs, field_paths=['compacted_through']) if snap.exists}
+    refold = sorted({(fixed.at[pos, 'user'], month_of(fixed.at[pos, 'date'])) for pos in changes
+                     if markers.get(fixed.at[pos, 'user']) and month_of(fixed.at[pos, 'date']) <= markers[fixed.at[pos, 'user']]})
+
+    for pos, fields in sorted(changes.items()):
+        user, day = fixed.at[pos, 'user'], fixed.at[pos, 'date']
+        diff = ", ".join(f"{field}: {stored.at[pos, field] if field in stored and pd.notna(stored.at[pos, field]) else '—'} → {value}"
+                         for field, value in fields.items() if field != 'carried_forward')
+        carried = " (dip carried forward)" if 'carried_forward' in fields else ""
+        print(f"{'🔎' if dry_run else '🛠'} {user} {day}: {diff}{carried}")
+
+    rebuild_team = whole_team and not load.failed
+    team = team_series(fixed) if rebuild_team else {}
+    verb = "would correct" if dry_run else "corrected"
+    if dry_run:
+        print(f"✅ Dry run: {verb} {len(changes)} day documents across {len(user_refs)} users, "
+              f"re-fold {len(refold)} compacted months, reset {len(pointers)} latest pointers "
+              f"and rebuild {len(team)} team_daily days.")
+        return
+
+    writer = db.bulk_writer()
+    for pos, fields in changes.items():
+        ref = db.collection('users').document(fixed.at[pos, 'user']).collection(DAILY_COLLECTION).document(fixed.at[pos, 'doc_id'])
+        writer.update(ref, fields)
+    for user, month in refold:
+        month_rows = fixed[(fixed['user'] == user) & (fixed['date'].str.startswith(month))].to_dict('records')
+        writer.set(db.collection('users').document(user).collection(MONTHLY_COLLECTION).document(month),
+                   fold_month(month, month_rows))
+    for user, pointer in pointers.items():
+        writer.set(db.collection('users').document(user), pointer, merge=True)
+    for day, doc in team.items():
+        writer.set(db.collection(TEAM_COLLECTION).document(day), doc)
+    writer.close()
+
+    if changes or refold or team:
+        bump_data_version(db)
+    print(f"✅ Backfill done: {verb} {len(changes)} day documents across {len(user_refs)} users, "
+          f"re-folded {len(refold)} compacted months, reset {len(pointers)} latest pointers, "
+          f"rebuilt {len(team)} team_daily days.")
+    if not whole_team:
+        print("⚠ Only part of the team was backfilled, so team_daily was left as is; run without a user range to rebuild it.")
+    elif load.failed:
+        print("⚠ Some users failed to load, so team_daily was left as is; rerun the backfill to rebuild it.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute totals-derived fields of historical daily_totals.")
+    parser.add_argument("--first-user", help="first user document id to backfill (inclusive)")
+    parser.add_argument("--last-user", help="last user document id to backfill (inclusive)")
+    parser.add_argument("--dry-run", action="store_true", help="only print the corrections that would be written")
+    args = parser.parse_args()
+
+    cred = credentials.Certificate("coding-team-profiles-2b0b4df65b4a.json")
+    try:
+        firebase_admin.get_app()
+    except ValueError:
+        firebase_admin.initialize_app(cred)
+    backfill(firestore.client(), args.first_user, args.last_user, dry_run=args.dry_run)
@@ -0,0 +1,100 @@
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from firebase_admin import firestore
+
+# Per-user scrape cadence derived from recent *_daily_increase history
+ACTIVE = "active"
+NORMAL = "normal"
+DORMANT = "dormant"
+
+ACTIVE_WINDOW_DAYS = 7     # look-back window for "active"
+ACTIVE_MIN_DAYS = 3        # days with progress within the window to count as active
+DORMANT_AFTER_DAYS = 14    # this many recorded days without progress = dormant
+DORMANT_EVERY_DAYS = 3     # dormant users get a full scrape every N days
+
+INCREASE_FIELDS = [
+    'leetcode_daily_increase',
+    'skillrack_daily_increase',
+    'codechef_daily_increase',
+    'hackerrank_daily_increase',
+    'github_daily_increase',
+]
+
+# users/{user} field with the per-day activity of the user's last DORMANT_AFTER_DAYS
+# recorded days, newest first; the scraper keeps it current with every write
+ACTIVITY_FIELD = 'recent_increases'
+
+
+def day_activity(row):
+    """One recorded day's progress: the sum of its positive daily increases."""
+    return sum(max(0, row.get(f) or 0) for f in INCREASE_FIELDS)
+
+
+def push_activity(recent, activity, same_day=False):
+    """`recent` with `activity` as the newest day (replacing it when the same day is rewritten)."""
+    recent = list(recent or [])
+    if same_day:
+        recent = recent[1:]
+    return ([activity] + recent)[:DORMANT_AFTER_DAYS]
+
+
+def recent_increases(db, user, days=DORMANT_AFTER_DAYS):
+    """Total daily increase for the user's last `days` recorded days, newest first."""
+    docs = (db.collection('users').document(user).collection('daily_totals')
+            .order_by('date', direction=firestore.Query.DESCENDING)
+            .limit(days)
+            .stream())
+    return [day_activity(doc.to_dict()) for doc in docs]
+
+
+def classify(increases):
+    if len(increases) < ACTIVE_WINDOW_DAYS:
+        return NORMAL  # not enough history yet
+    if sum(1 for inc in increases[:ACTIVE_WINDOW_DAYS] if inc > 0) >= ACTIVE_MIN_DAYS:
+        return ACTIVE
+    if len(increases) >= DORMANT_AFTER_DAYS and not any(increases[:DORMANT_AFTER_DAYS]):
+        return DORMANT
+    return NORMAL
+
+
+def due_for_full_scrape(user, tier, day):
+    """Dormant users are spread over DORMANT_EVERY_DAYS so each night checks a different slice."""
+    if tier != DORMANT:
+        return True
+    return (zlib.crc32(user.encode("utf-8")) + day.toordinal()) % DORMANT_EVERY_DAYS == 0
+
+
+def load_tiers(db, users, workers=8):
+    """
+    {user: tier} from the activity summary on each users/{user} document, in
+    one batched read. Users without a summary yet are classified from their
+    daily_totals once and get it written; unreadable ones fall back to NORMAL.
+    """
+    summaries = {}
+    try:
+        refs = [db.collection('users').document(user) for user in users]
+        for snap in db.get_all(refs, field_paths=[ACTIVITY_FIELD]):
+            recent = (snap.to_dict() or {}).get(ACTIVITY_FIELD) if snap.exists else None
+            if recent is not None:
+                summaries[snap.id] = recent
+    except Exception as e:
+        print(f"⚠ Could not read activity summaries, reading history instead: {e}")
+
+    def tier_for(user):
+        try:
+            increases = recent_increases(db, user)
+            db.collection('users').document(user).set({ACTIVITY_FIELD: increases}, merge=True)
+            return classify(increases)
+        except Exception as e:
+            print(f"⚠ Could not read activity history for {user}: {e}")
+            return NORMAL
+
+    missing = [user for user in users if user not in summaries]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        from_history = dict(zip(missing, pool.map(tier_for, missing)))
+    tiers = {user: from_history[user] if user in from_history else classify(summaries[user]) for user in users}
+
+    counts = {t: list(tiers.values()).count(t) for t in (ACTIVE, NORMAL, DORMANT)}
+    print(f"📈 Activity tiers: {counts[ACTIVE]} active, {counts[NORMAL]} normal, {counts[DORMANT]} dormant")
+    return tiers
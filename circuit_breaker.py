@@ -0,0 +1,81 @@
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class Outage(Exception):
+    """Raised by a wrapped call when the service itself is failing (timeout, 5xx, 429)."""
+
+
+class CircuitBreaker:
+    """
+    Trips after `failure_threshold` consecutive outages and then skips calls
+    for `reset_timeout` seconds. After that one trial call is let through
+    (half-open); success closes the circuit again, failure re-opens it.
+    """
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=300):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.skipped = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.skipped += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"✅ {self.name} circuit closed again")
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    print(f"⚠ {self.name} circuit opened after {self.failures} consecutive failures, "
+                          f"skipping calls for {self.reset_timeout}s")
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Runs fn unless the circuit is open (then returns None). Only an Outage
+        raised by fn counts as a failure; any other outcome, including None
+        (the scrapers' "unknown") or another error, means the service answered.
+        """
+        if not self.allow():
+            return None
+        try:
+            result = fn(*args, **kwargs)
+        except Outage as e:
+            print(f"⚠ {self.name} unavailable: {e}")
+            self.record_failure()
+            return None
+        except Exception as e:
+            print(f"⚠ {self.name} call failed: {e}")
+            result = None
+        self.record_success()
+        return result
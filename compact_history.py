@@ -0,0 +1,67 @@
+import argparse
+from collections import defaultdict
+
+import firebase_admin
+from firebase_admin import credentials, firestore
+
+from history_store import (DAILY_COLLECTION, MONTHLY_COLLECTION, current_month,
+                           first_day_after, fold_month, month_of)
+
+
+def compact_user(db, user_ref, compacted_through, this_month, dry_run=False):
+    """
+    Folds every closed month after `compacted_through` into one monthly
+    document and moves the user's marker forward. Raw day documents are
+    left in place; loaders simply stop reading them.
+    """
+    query = user_ref.collection(DAILY_COLLECTION).where('date', '<', f"{this_month}-01")
+    if compacted_through:
+        query = query.where('date', '>=', first_day_after(compacted_through))
+
+    months = defaultdict(list)
+    for doc in query.stream():
+        data = doc.to_dict()
+        if data.get('date'):
+            months[month_of(data['date'])].append(data)
+    if not months:
+        return []
+
+    if not dry_run:
+        batch = db.batch()
+        for month, rows in months.items():
+            batch.set(user_ref.collection(MONTHLY_COLLECTION).document(month), fold_month(month, rows))
+        batch.set(user_ref, {'compacted_through': max(months)}, merge=True)
+        batch.commit()
+    return sorted(months)
+
+
+def compact_all(db, dry_run=False):
+    this_month = current_month()
+    user_refs = list(db.collection('users').list_documents())
+    markers = {snap.id: (snap.to_dict() or {}).get('compacted_through')
+               for snap in db.get_all(user_refs) if snap.exists} if user_refs else {}
+
+    total = 0
+    for ref in user_refs:
+        try:
+            months = compact_user(db, ref, markers.get(ref.id), this_month, dry_run)
+        except Exception as e:
+            print(f"⚠ Failed to compact history for {ref.id}: {e}")
+            continue
+        if months:
+            total += len(months)
+            print(f"🗜 {ref.id}: {'would compact' if dry_run else 'compacted'} {', '.join(months)}")
+    print(f"✅ Compaction done: {total} user-months {'to fold' if dry_run else 'folded'}.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fold closed months of daily_totals into monthly documents.")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be compacted")
+    args = parser.parse_args()
+
+    cred = credentials.Certificate("coding-team-profiles-2b0b4df65b4a.json")
+    try:
+        firebase_admin.get_app()
+    except ValueError:
+        firebase_admin.initialize_app(cred)
+    compact_all(firestore.client(), dry_run=args.dry_run)
@@ -1,17 +1,28 @@
-import requests
 from bs4 import BeautifulSoup
 import re
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 import firebase_admin
 from firebase_admin import credentials, firestore
-from read_google_sheet import read_google_sheet
+from roster import load_roster, PLATFORMS, SHEET_NAME
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 import os
 import json
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+from rate_limiter import RateLimiter, is_outage, outage_status
+from circuit_breaker import CircuitBreaker, Outage
+from single_flight import SingleFlight
+from pipeline import Pipeline, Stage
+from scheduler import RunScheduler, REST_PLATFORMS, BROWSER_PLATFORMS
+import argparse
+from cadence import load_tiers, due_for_full_scrape, ACTIVE, ACTIVITY_FIELD, day_activity, push_activity
+from history_store import bump_data_version
+from firestore_meter import FirestoreMeter, metered_client
+from profile_store import save_profiles, profiles_from_roster
+from team_daily import TEAM_COLLECTION, contribution, team_update
+from async_store import AsyncFirestore, Pending
 
 def send_email_summary(to_email, subject, body, from_email, app_password, name, daily_data):
     try:
@@ -188,7 +199,9 @@ try:
     firebase_admin.get_app()
 except ValueError:
     firebase_admin.initialize_app(cred)
-db = firestore.client()
+# Counts every read and write of the run; printed at the end (budgets apply to the dashboards)
+FIRESTORE_METER = FirestoreMeter(read_budget=0, write_budget=0)
+db = metered_client(firestore.client(), FIRESTORE_METER)
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -198,6 +211,25 @@ HEADERS = {
     "Referer": "https://www.google.com/"
 }
 
+# One limiter per run, shared by every scraper so per-host quotas are respected
+RATE_LIMITER = RateLimiter()
+
+
+def raise_if_outage(e):
+    """Scrapers swallow their own errors except those meaning the site is down or throttling us."""
+    if isinstance(e, Outage):
+        raise e
+    if is_outage(e) or isinstance(e, PlaywrightTimeout):
+        raise Outage(str(e)) from e
+
+
+def check_page_status(url, resp):
+    """Outage for a 429/5xx page load; True if the profile doesn't exist."""
+    status = resp.status if resp else None
+    if outage_status(status):
+        raise Outage(f"{url} returned {status}")
+    return status == 404
+
 # ————— NEW SCRAPERS —————
 """
 def get_codechef_solved(username):
@@ -226,7 +258,15 @@ def get_codechef_solved(username):
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=True)
             page = browser.new_page()
-            page.goto(url, timeout=30000)
+            with RATE_LIMITER.slot(url) as slot:
+                resp = page.goto(url, timeout=30000)
+                if resp:
+                    slot.record(resp.status, resp.headers)
+            # Unknown users get a 404 or are redirected away from /users/
+            if check_page_status(url, resp) or "/users/" not in page.url:
+                print(f"⚠ CodeChef user not found: {username}")
+                browser.close()
+                return 0
             page.wait_for_timeout(3000)
 
             content = page.content()
@@ -244,8 +284,9 @@ def get_codechef_solved(username):
 
             browser.close()
     except Exception as e:
+        raise_if_outage(e)
         print(f"❌ Playwright error for CodeChef: {e}")
-    return 0
+    return None
 
 
 
@@ -259,7 +300,10 @@ def get_hackerrank_solved(username):
             'filter': 'categories:problem_solving'
         }
         
-        r = requests.get(url, headers=HEADERS, params=params, timeout=10)
+        r = RATE_LIMITER.get(url, headers=HEADERS, params=params, timeout=10)
+        if r.status_code == 404:
+            print(f"⚠ HackerRank user not found: {username}")
+            return 0
         r.raise_for_status()
         data = r.json()
         
@@ -273,8 +317,9 @@ def get_hackerrank_solved(username):
         return solved
         
     except Exception as e:
+        raise_if_outage(e)
         print(f"⚠ Error scraping HackerRank ({username}): {e}")
-        return 0
+        return None
     
 def get_github_repo_count(username):
     if not username:
@@ -285,66 +330,258 @@ def get_github_repo_count(username):
             headers['Authorization'] = f"token {os.getenv('GITHUB_TOKEN')}"
             
         url = f"https://api.github.com/users/{username}/repos?per_page=100"
-        r = requests.get(url, headers=headers, timeout=10)
+        r = RATE_LIMITER.get(url, headers=headers, timeout=10)
         if r.status_code == 200:
             data = r.json()
             return len(data)
-        elif r.status_code == 403:
-            print("⚠ GitHub API rate limit exceeded")
+        elif r.status_code == 404:
+            print(f"⚠ GitHub user not found: {username}")
+            return 0
+        elif r.status_code == 403 and r.headers.get('X-RateLimit-Remaining') == '0':
+            raise Outage(f"GitHub API rate limit exceeded (reset: {r.headers.get('X-RateLimit-Reset')})")
+        elif outage_status(r.status_code):
+            raise Outage(f"GitHub API returned {r.status_code}")
     except Exception as e:
+        raise_if_outage(e)
         print(f"⚠ Error scraping GitHub ({username}): {e}")
-    return 0
+    return None
+
+# ————— CIRCUIT BREAKERS —————
+# Scrapers return None when a value is unknown (site down, parse failure or
+# circuit open); unknown totals are carried forward from the previous day.
+# Only an Outage (timeout, 5xx, 429/throttled) counts towards opening a
+# platform's circuit; a handle that doesn't exist is a known 0.
+TOTAL_FIELDS = {
+    'leetcode': 'leetcode_total',
+    'skillrack': 'skillrack_total',
+    'codechef': 'codechef_total',
+    'hackerrank': 'hackerrank_total',
+    'github': 'github_repos',
+}
+DAILY_FIELDS = {
+    'leetcode': 'leetcode_daily_increase',
+    'skillrack': 'skillrack_daily_increase',
+    'codechef': 'codechef_daily_increase',
+    'hackerrank': 'hackerrank_daily_increase',
+    'github': 'github_daily_increase',
+}
+
+PLATFORM_BREAKERS = {platform: CircuitBreaker(platform) for platform in TOTAL_FIELDS}
+
+
+def scrape_platform(platform, scraper, handle):
+    """Runs a scraper behind its platform's circuit breaker. None means unknown."""
+    return PLATFORM_BREAKERS[platform].call(scraper, handle)
+
+
+# ————— REQUEST COALESCING —————
+def profile_key(platform, handle):
+    """(platform, handle) key that ignores case, whitespace and trailing slashes."""
+    handle = str(handle or "").strip().rstrip("/").lower()
+    if platform == 'leetcode':
+        handle = extract_leetcode_username(handle) or handle
+    return (platform, handle)
+
+
+def fetch_profile(flight, platform, scraper, handle):
+    """Scrapes each distinct profile once per run; duplicate roster rows reuse the result."""
+    return flight.do(profile_key(platform, handle), scrape_platform, platform, scraper, handle)
+
+
+def build_daily_data(totals, y_data):
+    """
+    Turns {platform: total or None} into a daily_totals payload.
+    Unknown totals reuse the previous value (increase 0) instead of dropping to 0.
+    With y_data=None there is no baseline and every increase is 0.
+    """
+    data = {}
+    carried = []
+    for platform, total_field in TOTAL_FIELDS.items():
+        previous = (y_data or {}).get(total_field, 0)
+        total = totals.get(platform)
+        if total is None:
+            total = previous
+            carried.append(platform)
+        data[total_field] = total
+        data[DAILY_FIELDS[platform]] = total - previous if y_data is not None else 0
+    if carried:
+        data['carried_forward'] = carried
+    return data
+
+
+# ————— LATEST POINTER —————
+# users/{user} holds the last written date and totals (plus the totals before
+# that date), so a diff needs one read however many days were missed.
+def _totals_only(data):
+    return {field: data.get(field, 0) for field in TOTAL_FIELDS.values()}
+
+
+def _pointer_from_user_doc(data):
+    if not data or not data.get('latest_date'):
+        return None
+    return {
+        'latest_date': data['latest_date'],
+        'latest_totals': data.get('latest_totals') or {},
+        'baseline_totals': data.get('baseline_totals'),
+        ACTIVITY_FIELD: data.get(ACTIVITY_FIELD),
+    }
+
+
+def load_latest_pointers(names):
+    """
+    {user: pointer} for every user that has one, fetched in a single batched
+    read. If that read fails the result is empty and each user's baseline
+    is read from their own history instead.
+    """
+    refs = [db.collection('users').document(name) for name in names]
+    pointers = {}
+    try:
+        for snap in db.get_all(refs):
+            pointer = _pointer_from_user_doc(snap.to_dict() if snap.exists else None)
+            if pointer:
+                pointers[snap.id] = pointer
+    except Exception as e:
+        print(f"⚠ Could not read latest pointers, falling back to per-user history: {e}")
+        return {}
+    return pointers
+
+
+def _recent_days_query(client, user, today):
+    """The user's last two days up to `today`; builds the same query on the sync or async client."""
+    return (client.collection('users').document(user).collection('daily_totals')
+                  .where('date', '<=', today)
+                  .order_by('date', direction=firestore.Query.DESCENDING)
+                  .limit(2))
+
+
+def _pointer_from_recent_days(docs, today):
+    if not docs:
+        return None
+    baseline = docs[1] if len(docs) > 1 else None
+    if docs[0].get('date') != today:
+        baseline = docs[0]
+    return {
+        'latest_date': docs[0].get('date'),
+        'latest_totals': _totals_only(docs[0]),
+        'baseline_totals': _totals_only(baseline) if baseline else None,
+    }
+
+
+def pointer_from_history(user, today):
+    """Builds a pointer from daily_totals for users written before pointers existed."""
+    docs = [d.to_dict() for d in _recent_days_query(db, user, today).stream()]
+    return _pointer_from_recent_days(docs, today)
+
+
+def baseline_for(pointer, today):
+    """Totals to diff `today` against: the last day recorded before today, or None."""
+    if pointer is None:
+        return None
+    if pointer['latest_date'] < today:
+        return pointer['latest_totals']
+    return pointer.get('baseline_totals')
+
+
+def next_pointer(pointer, today, latest_totals, activity):
+    same_day = pointer is not None and pointer['latest_date'] == today
+    return {
+        'latest_date': today,
+        'latest_totals': latest_totals,
+        'baseline_totals': baseline_for(pointer, today),
+        # Lets load_tiers classify every user from this document instead of their history
+        ACTIVITY_FIELD: push_activity((pointer or {}).get(ACTIVITY_FIELD), activity, same_day),
+    }
+
+
+def plan_daily_write(user, today, data, pointer, merge=False):
+    """
+    [(path, data, merge)] for a daily_totals document, the user's latest
+    pointer and their share of team_daily; applied as one atomic batch.
+    """
+    if merge and pointer is not None and pointer['latest_date'] == today:
+        latest_totals = dict(pointer['latest_totals'])
+        latest_totals.update({k: v for k, v in data.items() if k in TOTAL_FIELDS.values()})
+    else:
+        latest_totals = _totals_only(data)
+    writes = [(f"users/{user}/daily_totals/{today}", data, merge)]
+    # A late follow-up for an older day must not move the pointer backwards
+    if pointer is None or pointer['latest_date'] <= today:
+        new_share = contribution(latest_totals, baseline_for(pointer, today))
+        writes.append((f"users/{user}", next_pointer(pointer, today, latest_totals, day_activity(new_share)), True))
+        # The pointer also says what this user already added to today's team numbers
+        old_share = None
+        if pointer is not None and pointer['latest_date'] == today:
+            old_share = contribution(pointer['latest_totals'], pointer.get('baseline_totals'))
+        writes.append((f"{TEAM_COLLECTION}/{today}", team_update(today, new_share, old_share), True))
+    else:
+        print(f"⚠ {user}: {today} is older than the latest record, team_daily for it left unchanged")
+    return writes
+
+
+def write_daily_totals(user, today, data, pointer, merge=False):
+    """Writes a daily_totals document, the user's latest pointer and their share of team_daily in one atomic batch."""
+    batch = db.batch()
+    for path, payload, merge_doc in plan_daily_write(user, today, data, pointer, merge):
+        batch.set(db.document(path), payload, merge=merge_doc)
+    batch.commit()
+
+
+# ————— ASYNC PERSISTENCE —————
+# With FIRESTORE_ASYNC=1 the baseline lookup and every write go through
+# firestore.AsyncClient on its own event loop: the pointer read overlaps the
+# first scrapes, and persisting no longer holds a pipeline worker.
+FIRESTORE_ASYNC = os.getenv("FIRESTORE_ASYNC", "0") == "1"
+
+
+async def load_latest_pointers_async(store, names):
+    pointers = {}
+    try:
+        for snap in await store.get_all([f"users/{name}" for name in names]):
+            pointer = _pointer_from_user_doc(snap.to_dict() if snap.exists else None)
+            if pointer:
+                pointers[snap.id] = pointer
+    except Exception as e:
+        print(f"⚠ Could not read latest pointers, falling back to per-user history: {e}")
+        return {}
+    return pointers
+
+
+async def pointer_from_history_async(store, user, today):
+    return _pointer_from_recent_days(await store.stream(_recent_days_query(store.db, user, today)), today)
+
+
+async def write_daily_totals_async(store, user, today, data, pointer, merge=False):
+    await store.commit(plan_daily_write(user, today, data, pointer, merge))
+
 
 # ————— SAVE TO FIRESTORE —————
 def save_daily_totals_with_increase(user, lc_total, sr_total, cc_total, hr_total, gh_repos):
     today = datetime.now().strftime("%Y-%m-%d")
-    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-
-    coll = db.collection('users').document(user).collection('daily_totals')
-    today_ref = coll.document(today)
-    y_ref = coll.document(yesterday)
-
-    # Default yesterday totals
-    lc_y = sr_y = cc_y = hr_y = gh_y = 0
-
-    y_doc = y_ref.get()
-    if y_doc.exists:
-        y_data = y_doc.to_dict()
-        lc_y = y_data.get('leetcode_total', 0)
-        sr_y = y_data.get('skillrack_total', 0)
-        cc_y = y_data.get('codechef_total', 0)
-        hr_y = y_data.get('hackerrank_total', 0)
-        gh_y = y_data.get('github_repos', 0)
-
-    # Compute daily increases
-    lc_diff = lc_total - lc_y
-    sr_diff = sr_total - sr_y
-    cc_diff = cc_total - cc_y
-    hr_diff = hr_total - hr_y
-    gh_diff = gh_repos - gh_y
+
+    # Diff against the last recorded day, however long ago; none counts as all-zero totals
+    pointer = load_latest_pointers([user]).get(user) or pointer_from_history(user, today)
+    y_data = baseline_for(pointer, today) or {}
 
     # Prepare data payload
-    data = {
-        "date": today,
-        "leetcode_total": lc_total,
-        "skillrack_total": sr_total,
-        "codechef_total": cc_total,
-        "hackerrank_total": hr_total,
-        "github_repos": gh_repos,
-
-        "leetcode_daily_increase": lc_diff,
-        "skillrack_daily_increase": sr_diff,
-        "codechef_daily_increase": cc_diff,
-        "hackerrank_daily_increase": hr_diff,
-        "github_daily_increase": gh_diff
-    }
+    data = {"date": today}
+    data.update(build_daily_data({
+        'leetcode': lc_total,
+        'skillrack': sr_total,
+        'codechef': cc_total,
+        'hackerrank': hr_total,
+        'github': gh_repos,
+    }, y_data))
 
     # Save to Firestore
-    today_ref.set(data)
+    write_daily_totals(user, today, data, pointer)
 
+    carried = f" (carried forward: {', '.join(data['carried_forward'])})" if data.get('carried_forward') else ""
     print(f"✅ Saved for {user} on {today}: "
-          f"LC={lc_total}(+{lc_diff}), SR={sr_total}(+{sr_diff}), "
-          f"CC={cc_total}(+{cc_diff}), HR={hr_total}(+{hr_diff}), GH={gh_repos}(+{gh_diff})")
+          f"LC={data['leetcode_total']}(+{data['leetcode_daily_increase']}), "
+          f"SR={data['skillrack_total']}(+{data['skillrack_daily_increase']}), "
+          f"CC={data['codechef_total']}(+{data['codechef_daily_increase']}), "
+          f"HR={data['hackerrank_total']}(+{data['hackerrank_daily_increase']}), "
+          f"GH={data['github_repos']}(+{data['github_daily_increase']}){carried}")
 
 
 # ————— EXISTING SCRAPERS (leetcode & skillrack) —————
@@ -376,9 +613,13 @@ def get_leetcode_total(profile_url):
     """
     payload = {"query": query, "variables": {"username": uname}}
     try:
-        r = requests.post("https://leetcode.com/graphql", json=payload, headers={"Content-Type": "application/json"}, timeout=10)
+        r = RATE_LIMITER.post("https://leetcode.com/graphql", json=payload, headers={"Content-Type": "application/json"}, timeout=10)
         r.raise_for_status()
-        arr = (r.json().get("data", {}).get("matchedUser", {}).get("submitStats", {}).get("acSubmissionNum", []))
+        data = r.json().get("data") or {}
+        if "matchedUser" in data and data["matchedUser"] is None:
+            print(f"⚠ LeetCode user not found: {uname}")
+            return 0
+        arr = ((data.get("matchedUser") or {}).get("submitStats") or {}).get("acSubmissionNum", [])
         for entry in arr:
             if entry.get("difficulty", "").lower() == "all":
                 return entry.get("count", 0)
@@ -386,14 +627,17 @@ def get_leetcode_total(profile_url):
         pass
     # fallback page scrape
     try:
-        r2 = requests.get(f"https://leetcode.com/u/{uname}/", headers=HEADERS, timeout=10)
+        r2 = RATE_LIMITER.get(f"https://leetcode.com/u/{uname}/", headers=HEADERS, timeout=10)
+        if r2.status_code == 404:
+            print(f"⚠ LeetCode user not found: {uname}")
+            return 0
         r2.raise_for_status()
         m = re.search(r'"totalSolved":\s*(\d+)', r2.text)
         if m:
             return int(m.group(1))
-    except Exception:
-        pass
-    return 0
+    except Exception as e:
+        raise_if_outage(e)
+    return None
 
 def get_skillrack_total(url):
     if not url:
@@ -404,7 +648,14 @@ def get_skillrack_total(url):
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=True)
             page = browser.new_page()
-            page.goto(url, timeout=30000)
+            with RATE_LIMITER.slot(url) as slot:
+                resp = page.goto(url, timeout=30000)
+                if resp:
+                    slot.record(resp.status, resp.headers)
+            if check_page_status(url, resp):
+                print(f"⚠ Skillrack profile not found: {url}")
+                browser.close()
+                return 0
             page.wait_for_timeout(3000)  # Allow time for JS to load
             
             # Try extracting 'Programs Solved'
@@ -423,90 +674,141 @@ def get_skillrack_total(url):
 
             browser.close()
     except Exception as e:
+        raise_if_outage(e)
         print(f"❌ Playwright error: {e}")
-    return 0
+    return None
     
-# ————— MAIN DAILY SCRAPE —————
-def daily_scrape_all():
-    print("✅ Starting daily scrape…")
-    df = read_google_sheet("coding_team_profiles")
-    df.columns = df.columns.str.strip()
-    print(f"✅ Read {len(df)} rows")
-
-        # your Gmail
-    from_email = os.getenv("EMAIL_USER")
-    app_password = os.getenv("EMAIL_PASSWORD")  # app password from Googl
-
-    results = []
-
-    for _, row in df.iterrows():
-        name = row.get('Name')
-        email = row.get('Email IDd')
-        lc_url = row.get("LeetCode ID (eg: Gfz6n0WdOg or https://leetcode.com/u/Gfz6n0WdOg/)", "")
-        sr_url = row.get("Skillrack Profile URL", "")
-        cc_id = row.get("CodeChef Profile URL", "")
-        hr_id = row.get("Hackerrank Profile URL", "")
-        gh_user = row.get("GitHub Profile URL", "")
-
-        # Get current totals
-        lc_total = get_leetcode_total(lc_url)
-        sr_total = get_skillrack_total(sr_url)
-        cc_total = get_codechef_solved(cc_id)
-        hr_total = get_hackerrank_solved(hr_id)
-        gh_repos = get_github_repo_count(gh_user)
-
-        # Get yesterday's data from Firestore
-        today = datetime.now().strftime("%Y-%m-%d")
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-        
-        # Initialize daily differences as 0 (in case no yesterday data exists)
-        lc_diff = sr_diff = cc_diff = hr_diff = gh_diff = 0
-        
-        # Try to get yesterday's data
-        try:
-            coll = db.collection('users').document(name).collection('daily_totals')
-            y_doc = coll.document(yesterday).get()
-            
-            if y_doc.exists:
-                y_data = y_doc.to_dict()
-                lc_diff = lc_total - y_data.get('leetcode_total', 0)
-                sr_diff = sr_total - y_data.get('skillrack_total', 0)
-                cc_diff = cc_total - y_data.get('codechef_total', 0)
-                hr_diff = hr_total - y_data.get('hackerrank_total', 0)
-                gh_diff = gh_repos - y_data.get('github_repos', 0)
-        except Exception as e:
-            print(f"⚠ Error fetching yesterday's data for {name}: {e}")
-
-        # Prepare daily_data dictionary
-        daily_data = {
-            'leetcode_total': lc_total,
-            'leetcode_daily_increase': lc_diff,
-            'skillrack_total': sr_total,
-            'skillrack_daily_increase': sr_diff,
-            'codechef_total': cc_total,
-            'codechef_daily_increase': cc_diff,
-            'hackerrank_total': hr_total,
-            'hackerrank_daily_increase': hr_diff,
-            'github_repos': gh_repos,
-            'github_daily_increase': gh_diff
-            }
-
-
-        print(f"\n👤 {name}")
-        lc_total = get_leetcode_total(lc_url)
-        print(f" LeetCode: {lc_total}")
+SCRAPERS = {
+    'leetcode': get_leetcode_total,
+    'skillrack': get_skillrack_total,
+    'codechef': get_codechef_solved,
+    'hackerrank': get_hackerrank_solved,
+    'github': get_github_repo_count,
+}
 
-        sr_total = get_skillrack_total(sr_url)
-        print(f" Skillrack: {sr_total}")
+# ————— PIPELINE STAGES —————
+# Each user flows scrape → diff → persist → notify; stages overlap so a slow
+# SMTP send or Firestore write never holds up the next user's scraping.
+SCRAPE_WORKERS = int(os.getenv("SCRAPE_WORKERS", "4"))
+BROWSER_WORKERS = int(os.getenv("BROWSER_WORKERS", "2"))
+IO_WORKERS = int(os.getenv("IO_WORKERS", "2"))
+# Wall-clock budget for the scraping itself; the CI job times out a bit later
+RUN_BUDGET_MINUTES = float(os.getenv("RUN_BUDGET_MINUTES", "50"))
 
-        cc_total = get_codechef_solved(cc_id)
-        print(f" CodeChef: {cc_total}")
 
-        hr_total = get_hackerrank_solved(hr_id)
-        print(f" HackerRank badges: {hr_total}")
+def _timed(scheduler, platform, scraper):
+    def run(handle):
+        start = time.monotonic()
+        try:
+            return scraper(handle)
+        finally:
+            scheduler.record(platform, time.monotonic() - start)
+    return run
+
+
+def make_scrape_stage(flight, scheduler, platforms):
+    def scrape(work):
+        # Get current totals (None = unknown, e.g. platform circuit open or deferred).
+        # Invalid handles were reported by load_roster and are never requested.
+        entry = work['entry']
+        totals = work.setdefault('totals', {})
+        for platform in platforms:
+            if platform not in work['platforms']:
+                continue
+            handle = entry.handle(platform)
+            if handle is None:
+                totals[platform] = None
+            elif handle and not scheduler.try_start(platform):
+                scheduler.defer(entry.name, platform, work['today'])
+                totals[platform] = None
+            else:
+                scraper = _timed(scheduler, platform, SCRAPERS[platform])
+                totals[platform] = fetch_profile(flight, platform, scraper, handle)
+        return work
+    return scrape
+
+
+def diff_stage(work):
+    name = work['entry'].name
+
+    # Diff against the last recorded day (from the pointers read up front).
+    # y_data stays None only for a user with no history at all.
+    try:
+        pointer = work['pointers'].get(name)
+        if pointer is None:
+            store = work.get('store')
+            if store is None:
+                pointer = pointer_from_history(name, work['today'])
+            else:
+                pointer = store.run(pointer_from_history_async(store, name, work['today']))
+        work['pointer'] = pointer
+        y_data = baseline_for(pointer, work['today'])
+        # Partial runs merge into today's document only if it already exists
+        work['today_exists'] = pointer is not None and pointer['latest_date'] == work['today']
+    except Exception as e:
+        # Without a baseline every increase would be written as 0, so nothing is saved or emailed
+        print(f"❌ Could not read previous data for {name}, skipping their save: {e}")
+        return None
 
-        gh_repos = get_github_repo_count(gh_user)
-        print(f" GitHub repos: {gh_repos}")
+    # Prepare daily_data dictionary; unknown totals carry the last known value forward
+    daily_data = build_daily_data(work['totals'], y_data)
+    work['daily_data'] = daily_data
+
+    print(f"\n👤 {name}\n"
+          f" LeetCode: {daily_data['leetcode_total']}\n"
+          f" Skillrack: {daily_data['skillrack_total']}\n"
+          f" CodeChef: {daily_data['codechef_total']}\n"
+          f" HackerRank badges: {daily_data['hackerrank_total']}\n"
+          f" GitHub repos: {daily_data['github_repos']}")
+    return work
+
+
+def _save(work, data, merge, message):
+    name = work['entry'].name
+    store = work.get('store')
+    if store is None:
+        write_daily_totals(name, work['today'], data, work.get('pointer'), merge=merge)
+        print(message)
+        return
+    # Returns at once; the notify stage waits for this write before emailing
+    work['saved'] = store.submit(write_daily_totals_async(store, name, work['today'], data, work.get('pointer'), merge))
+    work['saved'].add_done_callback(
+        lambda f: print(message if f.exception() is None else f"❌ Failed to save {name}: {f.exception()}"))
+
+
+def persist_stage(work):
+    name = work['entry'].name
+    if work['partial'] and work.get('today_exists'):
+        # Follow-up/intraday run: only fill in the platforms scraped this time
+        scraped = [p for p in work['platforms'] if work['totals'].get(p) is not None]
+        if not scraped:
+            return work
+        data = {"date": work['today']}
+        for platform in scraped:
+            data[TOTAL_FIELDS[platform]] = work['daily_data'][TOTAL_FIELDS[platform]]
+            data[DAILY_FIELDS[platform]] = work['daily_data'][DAILY_FIELDS[platform]]
+        data['carried_forward'] = firestore.ArrayRemove(scraped)
+        _save(work, data, True, f"✅ Filled in {', '.join(scraped)} for {name} on {work['today']}")
+        return work
+
+    data = {"date": work['today']}
+    data.update(work['daily_data'])
+    _save(work, data, False, f"✅ Saved for {name} on {work['today']}")
+    return work
+
+
+def make_notify_stage(from_email, app_password):
+    def notify(work):
+        name = work['entry'].name
+        email = work['entry'].email
+        if work.get('saved') is not None and work['saved'].exception() is not None:
+            return None  # same as a failed persist stage: no email for unsaved data
+        daily_data = work['daily_data']
+        lc_total = daily_data['leetcode_total']
+        sr_total = daily_data['skillrack_total']
+        cc_total = daily_data['codechef_total']
+        hr_total = daily_data['hackerrank_total']
+        gh_repos = daily_data['github_repos']
 
         # personalize email body
         body = f"""
@@ -535,21 +837,140 @@ Happy coding,
         else:
             print(f"⚠ No email found for {name}, skipping email.")
 
-        #save_daily_totals_with_increase(name, lc_total, sr_total, cc_total, hr_total, gh_repos)
-
-        results.append({
+        return {
             'Name': name,
             'LeetCode Total': lc_total,
             'Skillrack Total': sr_total,
             'CodeChef Total': cc_total,
             'HackerRank Badges': hr_total,
             'GitHub Repos': gh_repos
-        })
+        }
+    return notify
+
+
+# ————— MAIN DAILY SCRAPE —————
+def daily_scrape_all(follow_up=False, intraday=False):
+    """
+    Scrapes the roster within RUN_BUDGET_MINUTES; dormant users only get a
+    full scrape every few days. With follow_up=True only the profiles
+    deferred by the previous run are scraped; with intraday=True only the
+    REST platforms of active users are refreshed. Both merge into the day's
+    documents and send no emails.
+    """
+    partial = follow_up or intraday
+    if follow_up:
+        print("✅ Starting follow-up scrape…")
+    elif intraday:
+        print("✅ Starting intraday refresh…")
+    else:
+        print("✅ Starting daily scrape…")
+    roster = load_roster(SHEET_NAME)
+    print(f"✅ Read {len(roster)} roster entries")
+    if not partial:
+        # Dashboards read profile links from here instead of the sheet
+        try:
+            save_profiles(db, profiles_from_roster(roster))
+        except Exception as e:
+            print(f"⚠ Could not publish profile links: {e}")
+
+    # your Gmail
+    from_email = os.getenv("EMAIL_USER")
+    app_password = os.getenv("EMAIL_PASSWORD")  # app password from Google
+
+    scheduler = RunScheduler(RUN_BUDGET_MINUTES * 60)
+    # A host paused past the end of the run yields unknown totals instead of a hung worker
+    RATE_LIMITER.deadline = scheduler.deadline
+    now = datetime.now()
+    if follow_up:
+        roster = [e for e in roster if scheduler.pending_platforms(e.name)]
+        if not roster:
+            print("✅ Nothing was deferred, follow-up not needed.")
+            return
+        if scheduler.previous_date:
+            now = datetime.strptime(scheduler.previous_date, "%Y-%m-%d")
+    today = now.strftime("%Y-%m-%d")
+    flight = SingleFlight()
+
+    def platforms_for(entry):
+        if follow_up:
+            return scheduler.pending_platforms(entry.name)
+        if intraday:
+            return REST_PLATFORMS
+        if due_for_full_scrape(entry.name, tiers.get(entry.name), now.date()):
+            return PLATFORMS
+        return []  # dormant and not due: everything carries forward
+
+    if not follow_up:
+        tiers = load_tiers(db, [e.name for e in roster])
+        if intraday:
+            roster = [e for e in roster if tiers.get(e.name) == ACTIVE]
+            if not roster:
+                print("✅ No active users to refresh.")
+                return
+        else:
+            resting = [e.name for e in roster if not platforms_for(e)]
+            if resting:
+                print(f"💤 {len(resting)} dormant users not due today, carrying their totals forward")
+
+    # One batched read gives every user's diff baseline, whatever nights were missed
+    store = AsyncFirestore(FIRESTORE_METER) if FIRESTORE_ASYNC else None
+    if store is None:
+        pointers = load_latest_pointers([e.name for e in roster])
+    else:
+        # Scraping starts right away; the diff stage waits for the pointers only when it needs them
+        pointers = Pending(store.submit(load_latest_pointers_async(store, [e.name for e in roster])))
+
+    stages = [
+        Stage("scrape_rest", make_scrape_stage(flight, scheduler, REST_PLATFORMS), workers=SCRAPE_WORKERS),
+        # Unbounded, so cheap REST results for everyone never wait behind browser scrapes
+        Stage("scrape_browser", make_scrape_stage(flight, scheduler, BROWSER_PLATFORMS),
+              workers=BROWSER_WORKERS, maxsize=0),
+        Stage("diff", diff_stage, workers=IO_WORKERS),
+        Stage("persist", persist_stage, workers=IO_WORKERS),
+    ]
+    if not partial:
+        stages.append(Stage("notify", make_notify_stage(from_email, app_password), workers=IO_WORKERS))
+    pipeline = Pipeline(stages)
+    results = pipeline.run(
+        {
+            'entry': entry,
+            'today': today,
+            'pointers': pointers,
+            'store': store,
+            'platforms': platforms_for(entry),
+            'partial': partial,
+        }
+        for entry in scheduler.order(roster)
+    )
 
-    print("\n📊 Daily scrape complete.")
+    if store is not None:
+        store.close()  # every write is committed before the run is reported or published
+    print("\n📊 Scrape complete.")
     for r in results:
-        print(r)
+        if isinstance(r, dict) and 'Name' in r:
+            print(r)
+    pipeline.report()
+    if not intraday:
+        # Intraday refreshes must not clobber the nightly run's deferral report
+        scheduler.save_report(today)
+    try:
+        # Dashboards key their shared cache on this, so they reload once per run
+        bump_data_version(db)
+    except Exception as e:
+        print(f"⚠ Could not publish new data version: {e}")
+    if flight.hits:
+        print(f"♻ {flight.hits} duplicate profile lookups served from this run's results")
+    for platform, breaker in PLATFORM_BREAKERS.items():
+        if breaker.skipped:
+            print(f"⚠ {platform}: {breaker.skipped} calls skipped while circuit was open")
+    print(f"📈 Firestore usage: {FIRESTORE_METER.summary()}")
 
 if __name__ == "__main__":
-    daily_scrape_all()
-
+    parser = argparse.ArgumentParser(description="Scrape coding profiles and record daily totals.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--follow-up", action="store_true",
+                      help="only scrape profiles deferred by the previous run")
+    mode.add_argument("--intraday", action="store_true",
+                      help="refresh the fast REST platforms for active users only")
+    args = parser.parse_args()
+    daily_scrape_all(follow_up=args.follow_up, intraday=args.intraday)
@@ -3,10 +3,22 @@ import firebase_admin
 from firebase_admin import credentials, firestore
 import pandas as pd
 from datetime import datetime, timedelta
+import time
 import plotly.express as px
 import plotly.graph_objects as go
 from streamlit_extras.metric_cards import style_metric_cards
 from streamlit_extras.grid import grid
+from history_store import load_history, read_data_version, DASHBOARD_FIELDS
+from prefix_index import PrefixSumIndex
+from rollups import build_rollups, series_for, team_series_for, TEAM
+from downsample import downsample_lines, downsample_bars, DEFAULT_POINT_BUDGET
+from explorer_index import ExplorerIndex
+from shared_cache import SharedCache
+from live_updates import HistoryListener, upsert_rows, LIVE_CHECK_SECONDS
+from firestore_meter import FirestoreMeter, BudgetExceeded, metered_client
+from profile_store import load_profiles
+from rankings import RankHistory
+from team_daily import load_team_daily
 
 # Custom CSS for enhanced styling
 st.set_page_config(
@@ -150,8 +162,16 @@ if not firebase_admin._apps:
     cred = credentials.Certificate(firebase_key_dict)
     firebase_admin.initialize_app(cred)
 
-# ✅ Now define Firestore client
-db = firestore.client()
+# ✅ Now define Firestore client, metered per session (FIRESTORE_READ_BUDGET caps its reads)
+if 'firestore_meter' not in st.session_state:
+    st.session_state.firestore_meter = FirestoreMeter()
+meter = st.session_state.firestore_meter
+db = metered_client(firestore.client(), meter)
+
+# The shared listener's reads belong to the process, not to whichever session started it
+@st.cache_resource
+def get_process_meter():
+    return FirestoreMeter(read_budget=0, write_budget=0)
 
 # Title with gradient background
 st.markdown("""
@@ -161,30 +181,22 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Load Data
-@st.cache_data(ttl=3600)
-def load_data():
-    rows = []
-    users = db.collection('users').list_documents()
-    for u in users:
-        user_id = u.id
-        docs = u.collection('daily_totals').stream()
-        for doc in docs:
-            d = doc.to_dict()
-            d['user'] = user_id
-            rows.append(d)
-    return pd.DataFrame(rows)
-
-with st.spinner('🔥 Loading team data from Firestore...'):
-    df = load_data()
-    
-if df.empty:
-    st.error("⚠ No data found in Firestore. Please run the data collection script first.")
-    st.stop()
+# Data is shared across dashboard replicas, keyed by the version the scraper
+# publishes after each run: the fleet does one Firestore load per data change.
+SHARED_CACHE = SharedCache.from_env()
+
+# Snapshot listeners push new versions and freshly written rows to this process
+@st.cache_resource
+def get_listener():
+    listener_db = metered_client(firestore.client(), get_process_meter())
+    return HistoryListener(listener_db, fields=DASHBOARD_FIELDS).start()
 
-# Data Preprocessing
-df = df.sort_values(['user', 'date']).reset_index(drop=True)
-df['date'] = pd.to_datetime(df['date'])
+# Polled only while the listener has not (or could not) report a version
+@st.cache_data(ttl=60)
+def get_data_version():
+    version = read_data_version(db)
+    # Until a run has published a version, fall back to refreshing hourly
+    return version if version is not None else f"h{int(time.time() // 3600)}"
 
 platforms = {
     'leetcode': {'total': 'leetcode_total', 'daily': 'leetcode_daily_increase'},
@@ -194,21 +206,125 @@ platforms = {
     'github': {'total': 'github_repos', 'daily': 'github_daily_increase'}
 }
 
-# Ensure all columns exist and calculate daily increases
-for platform, cols in platforms.items():
-    if cols['total'] not in df.columns:
-        df[cols['total']] = 0
-    if cols['daily'] not in df.columns:
-        df[cols['daily']] = 0
-    df[cols['daily']] = df.groupby('user')[cols['total']].diff().fillna(0).astype(int)
+def preprocess(df):
+    if df.empty:
+        return df
+    df = df.sort_values(['user', 'date']).reset_index(drop=True)
+    df['date'] = pd.to_datetime(df['date'])
+
+    # Ensure all columns exist and calculate daily increases
+    for platform, cols in platforms.items():
+        if cols['total'] not in df.columns:
+            df[cols['total']] = 0
+        if cols['daily'] not in df.columns:
+            df[cols['daily']] = 0
+        df[cols['daily']] = df.groupby('user')[cols['total']].diff().fillna(0).astype(int)
+
+    df['total_solved'] = df['leetcode_total'] + df['skillrack_total'] + df['codechef_total'] + df['hackerrank_total']
+    df['total_daily_increase'] = df['leetcode_daily_increase'] + df['skillrack_daily_increase'] + df['codechef_daily_increase'] + df['hackerrank_daily_increase']
+    return df
 
-df['total_solved'] = df['leetcode_total'] + df['skillrack_total'] + df['codechef_total'] + df['hackerrank_total']
-df['total_daily_increase'] = df['leetcode_daily_increase'] + df['skillrack_daily_increase'] + df['codechef_daily_increase'] + df['hackerrank_daily_increase']
+# Load Data (compacted months + recent raw days), preprocessed once per version
+@st.cache_data(max_entries=2)
+def load_data(version):
+    def load():
+        history = SHARED_CACHE.get_or_compute('history', version, load_history, db, DASHBOARD_FIELDS)
+        print(f"📈 Firestore usage this session: {meter.summary()}")
+        return preprocess(history)
+    return SHARED_CACHE.get_or_compute('dash_frame', version, load)
 
-# Create tabs
-tab1, tab2, tab3, tab4 = st.tabs(["🏆 Leaderboard", "📅 Weekly Summary", "📈 Individual Progress", "🔍 Raw Data"])
+# Rows written since the last version are applied on top, recomputing only their users
+@st.cache_data(max_entries=2)
+def load_live_data(version, token, _rows):
+    df = load_data(version)
+    if not _rows or df.empty:
+        return df
+    users = {row['user'] for row in _rows}
+    touched = df['user'].isin(users)
+    updated = preprocess(upsert_rows(df[touched], _rows))
+    return pd.concat([df[~touched], updated]).sort_values(['user', 'date']).reset_index(drop=True)
 
-with tab1:
+listener = get_listener()
+version, live_token, live_rows = listener.snapshot()
+over_budget = False
+try:
+    if version is None:
+        version = get_data_version()
+    with st.spinner('🔥 Loading team data from Firestore...'):
+        df = load_live_data(version, live_token, live_rows)
+except BudgetExceeded as e:
+    # Out of reads for this session: serve whatever the fleet loaded last
+    over_budget = True
+    version, df = SHARED_CACHE.latest('dash_frame')
+    live_token = ''
+    if df is None:
+        st.error(f"⚠ {e} and no cached data is available yet.")
+        st.stop()
+    st.warning(f"⚠ {e}; showing cached data from version {version}.")
+data_key = f"{version}+{live_token}" if live_token else version
+
+# Reruns the page as soon as the listener has something newer than what is shown
+@st.fragment(run_every=LIVE_CHECK_SECONDS)
+def watch_for_updates():
+    latest, latest_token, _ = listener.snapshot()
+    if (latest if latest is not None else version, latest_token) != (version, live_token):
+        st.rerun()
+
+if not over_budget:
+    watch_for_updates()
+
+with st.sidebar.expander("🔧 Firestore usage"):
+    st.metric("Reads this session", meter.reads, help=f"{meter.read_bytes / 1024:.1f} KB")
+    st.metric("Writes this session", meter.writes, help=f"{meter.write_bytes / 1024:.1f} KB")
+    if meter.read_budget:
+        st.progress(min(meter.reads / meter.read_budget, 1.0), text=f"Read budget: {meter.reads}/{meter.read_budget}")
+    st.caption(f"Live listener (whole process): {get_process_meter().summary()}")
+    
+if df.empty:
+    st.error("⚠ No data found in Firestore. Please run the data collection script first.")
+    st.stop()
+
+# Derived views are built once per data version and shared like the frame itself
+
+# Prefix sums over the daily increases: any date-range total is an O(1) lookup
+@st.cache_resource(max_entries=2)
+def get_prefix_index(_df, data_key):
+    return SHARED_CACHE.get_or_compute('prefix_index', data_key, PrefixSumIndex, _df)
+
+# Weekly/monthly rollups per user and team-wide, for long-range charts
+@st.cache_resource(max_entries=2)
+def get_rollups(_df, data_key):
+    return SHARED_CACHE.get_or_compute('rollups', data_key, build_rollups, _df)
+
+# Date-sorted row index for the Raw Data Explorer's filters and pagination
+@st.cache_resource(max_entries=2)
+def get_explorer_index(_df, data_key):
+    return SHARED_CACHE.get_or_compute('explorer_index', data_key, ExplorerIndex, _df)
+
+# Team totals per day, maintained incrementally by the scraper
+@st.cache_data(max_entries=2)
+def get_team_daily(version):
+    return SHARED_CACHE.get_or_compute('team_daily', version, load_team_daily, db)
+
+def load_team_series():
+    """team_daily for the current version, or the last cached copy once the read budget is spent."""
+    try:
+        return get_team_daily(version)
+    except BudgetExceeded:
+        return SHARED_CACHE.latest('team_daily')[1]
+
+# Every member's rank on every day (by total and by the last 7 days), for rank-movement charts
+@st.cache_resource(max_entries=2)
+def get_rank_history(_df, data_key):
+    return SHARED_CACHE.get_or_compute('rank_history', data_key, RankHistory, _df)
+
+# Upper bound on points per chart; larger series are downsampled before plotting
+point_budget = st.sidebar.slider("Chart point budget", min_value=100, max_value=2000,
+                                 value=DEFAULT_POINT_BUDGET, step=100,
+                                 help="Maximum points sent to the browser per chart")
+
+# Each view is a function; only the selected one runs (see navigation below)
+def render_leaderboard():
     # Leaderboard Section
     st.markdown("### 🏆 Coding Champions Leaderboard")
     
@@ -280,26 +396,59 @@ with tab1:
     fig_pie.update_traces(textposition='inside', textinfo='percent+label')
     st.plotly_chart(fig_pie, use_container_width=True)
 
-with tab2:
+    # Rank movement
+    st.markdown("### 📈 Rank Movement")
+    ranks = get_rank_history(df, data_key)
+    climbers = ranks.biggest_climbers(n=3)
+    if climbers:
+        st.markdown(
+            "**Biggest climbers this week:** " + "".join(
+                f'<span class="badge gh-badge">🚀 {user} +{places}</span>' for user, places in climbers),
+            unsafe_allow_html=True
+        )
+    else:
+        st.caption("No one has moved up the leaderboard in the last 7 days.")
+
+    rank_by = st.radio("Rank by", ["Total solved", "Solved in the last 7 days"], horizontal=True, key="rank_by")
+    followed = st.multiselect("Team members", options=list(leaderboard['user']),
+                              default=list(leaderboard['user'].head(5)), key="rank_users")
+    if followed:
+        history = ranks.long_frame(followed, by='total' if rank_by == "Total solved" else 'form')
+        history = history[history['date'] > history['date'].max() - timedelta(days=90)]
+        fig_rank = px.line(history, x='date', y='rank', color='user', line_shape='hv',
+                           title="Leaderboard position over the last 90 days")
+        fig_rank.update_yaxes(autorange='reversed', dtick=1, title="Rank")
+        st.plotly_chart(fig_rank, use_container_width=True)
+
+def render_weekly_summary():
+    prefix_index = get_prefix_index(df, data_key)
+    rollups = get_rollups(df, data_key)
+    
     # Weekly Summary Section
     st.markdown("### 📅 Weekly Performance Summary")
     
     today = df['date'].max()
-    week_ago = today - timedelta(days=7)
-    week_df = df[df['date'] > week_ago]
+    window_options = {"Last 7 days": 7, "Last 30 days": 30, "Last 90 days": 90, "Custom range": None}
+    window_label = st.radio("Summary window", list(window_options), horizontal=True, key="summary_window")
+    if window_options[window_label] is None:
+        custom_range = st.date_input("Custom range",
+                                     value=[today - timedelta(days=6), today],
+                                     min_value=df['date'].min(),
+                                     max_value=today,
+                                     key="summary_custom_range")
+        window_start, window_end = (custom_range if len(custom_range) == 2 else (custom_range[0], custom_range[0]))
+    else:
+        window_start, window_end = today - timedelta(days=window_options[window_label] - 1), today
     
-    weekly = week_df.groupby('user').agg({
-        'leetcode_daily_increase': 'sum',
-        'skillrack_daily_increase': 'sum',
-        'codechef_daily_increase': 'sum',
-        'hackerrank_daily_increase': 'sum',
-        'github_daily_increase': 'sum'
-    }).reset_index()
+    weekly = prefix_index.window_totals(window_start, window_end)
     
     weekly['total_weekly_increase'] = weekly['leetcode_daily_increase'] + weekly['skillrack_daily_increase'] + weekly['codechef_daily_increase'] + weekly['hackerrank_daily_increase'] + weekly['github_daily_increase']
     
+    st.caption(f"{pd.Timestamp(window_start).date()} to {pd.Timestamp(window_end).date()} · "
+               f"team total: {int(weekly['total_weekly_increase'].sum())} activities")
+    
     # Top performers
-    st.markdown("#### 🚀 Top Performers This Week")
+    st.markdown(f"#### 🚀 Top Performers ({window_label})")
     top_weekly = weekly.sort_values('total_weekly_increase', ascending=False).head(3)
     
     cols = st.columns(3)
@@ -359,6 +508,24 @@ with tab2:
     )
     st.plotly_chart(fig_weekly, use_container_width=True)
     
+    # Team activity over the selected window, rolled up to keep the chart light.
+    # team_daily has one row per day; per-user rollups only cover days before it existed.
+    st.markdown("#### 👥 Team Activity Over Time")
+    team = load_team_series()
+    if team is not None and not team.empty and team['date'].min() <= pd.Timestamp(window_start):
+        team_granularity, team_df = team_series_for(team, window_start, window_end)
+    else:
+        team_granularity, team_df = series_for(rollups, TEAM, window_start, window_end)
+    fig_team = px.bar(
+        downsample_bars(team_df, 'date', ['total_daily_increase'], point_budget),
+        x='date',
+        y='total_daily_increase',
+        color_discrete_sequence=['#667eea'],
+        height=350,
+        labels={'total_daily_increase': 'Team Activity', 'date': team_granularity.capitalize()}
+    )
+    st.plotly_chart(fig_team, use_container_width=True)
+    
     # Weekly comparison table
     st.markdown("#### 📋 Detailed Weekly Stats")
     st.dataframe(
@@ -377,85 +544,17 @@ with tab2:
     )
 
 
-@st.cache_data
-def load_profile_data():
-    # This would come from your database or CSV
-    profiles = {
-        "Dinesh Kumar ": {
-            "leetcode_url": "https://leetcode.com/u/H0NMwD8pgx/",
-            "skillrack_url": "http://www.skillrack.com/profile/470460/a23770d067e4cbf60eaa99c5f47397c8fc43ea3e",
-            "github_url": "https://github.com/dineshkumar-cmd",
-            "codechef_url": "https://www.codechef.com/users/many_bees_88",
-            "hackerrank_url": "https://www.hackerrank.com/dineshkumarnov30"
-        },
-        "Pravin": {
-            "leetcode_url": "https://leetcode.com/u/pravin_5905/",
-            "skillrack_url": "http://www.skillrack.com/profile/470477/21b5f47d2a322c8474c9a34362b21f976633fa1e",
-            "github_url": "",
-            "codechef_url": "",
-            "hackerrank_url": ""
-        },
-        "vijaianandhan": {
-            "leetcode_url": "https://leetcode.com/u/vijaianandhan/",
-            "skillrack_url": "http://www.skillrack.com/profile/470496/ec60f77f7a1571e0d809e14dfbb2e6450cb8f0a9",
-            "github_url": "",
-            "codechef_url": "",
-            "hackerrank_url": ""
-        },
-        "Agilesh S": {
-            "leetcode_url": "https://leetcode.com/u/Gfz6n0WdOg/",
-            "skillrack_url": "https://www.skillrack.com/faces/resume.xhtml?id=470448&key=c9270c3cd7d74cb9454fb74943194b4ae48b4016",
-            "github_url": "https://github.com/itz-ask916",
-            "codechef_url": "https://www.codechef.com/users/agilesh304",
-            "hackerrank_url": "https://www.hackerrank.com/agilesh304"
-        },
-        "Bharathi G ": {
-            "leetcode_url": "https://leetcode.com/u/Bharathi205/",
-            "skillrack_url": "http://www.skillrack.com/profile/470456/d33cc0a558937e9431c83b1ed2eb328d15edca7a",
-            "github_url": "",
-            "codechef_url": "",
-            "hackerrank_url": ""
-        },
-        "Jai Akash.S": {
-            "leetcode_url": "https://leetcode.com/u/Jai18/",
-            "skillrack_url": "http://www.skillrack.com/profile/470463/862aee4b3a65ba0bdb7de48292660009c4406c7a",
-            "github_url": "",
-            "codechef_url": "",
-            "hackerrank_url": ""
-        },
-        "Santhosh": {
-            "leetcode_url": "https://leetcode.com/u/Sandy@2005/",
-            "skillrack_url": "http://www.skillrack.com/profile/470486/fe68318010bade92eb1942794abb41511f332e87",
-            "github_url": "https://github.com/santhosh-1110",
-            "codechef_url": "https://www.codechef.com/users/santhosh_1110",
-            "hackerrank_url": "https://www.hackerrank.com/santhoshdeiva705"
-        },
-        "Yash S": {
-            "leetcode_url": "https://leetcode.com/u/yash_6003/",
-            "skillrack_url": "https://www.skillrack.com/faces/resume.xhtml?id=470498&key=1a3a809579fb0112d792aaee2056e264572d308b",
-            "github_url": "https://github.com/yash-6003",
-            "codechef_url": "https://www.codechef.com/users/yash_6003",
-            "hackerrank_url": "https://www.hackerrank.com/yashsurya5454"
-        },
-        "V N Akash": {
-            "leetcode_url": "https://leetcode.com/u/VNAkash/",
-            "skillrack_url": "https://www.skillrack.com/faces/resume.xhtml?id=470449&key=845ba0ccf1e7e75af3d453f7b194364ee316cc2e",
-            "github_url": "",
-            "codechef_url": "",
-            "hackerrank_url": ""
-        },
-        "Vignesh K": {
-            "leetcode_url": "",
-            "skillrack_url": "https://www.skillrack.com/faces/resume.xhtml?id=470495&key=914b3969fff544b6c4d4b37feb99b146c391afee",
-            "github_url": "",
-            "codechef_url": "",
-            "hackerrank_url": ""
-        },
-        
-    }
-    return profiles
+# Profile links come from the roster the scraper publishes; one read per data version
+@st.cache_data(max_entries=2)
+def load_profile_data(version):
+    return SHARED_CACHE.get_or_compute('profiles', version, load_profiles, db)
 
-with tab3:
+# Fragments rerun on their own: changing the selected member or the explorer
+# filters only recomputes that section, not the whole page.
+@st.fragment
+def render_individual_progress():
+    rollups = get_rollups(df, data_key)
+    
     # Custom CSS for this tab with improved contrast and readability
     st.markdown("""
     <style>
@@ -581,10 +680,13 @@ with tab3:
             <p style="color: #718096; font-size: 0.9rem;">Please check your data and try again.</p>
         </div>
         """, unsafe_allow_html=True)
-        st.stop()
+        return
 
     # --- Profile Links ---
-    profile_data = load_profile_data()
+    try:
+        profile_data = load_profile_data(version)
+    except BudgetExceeded:
+        profile_data = SHARED_CACHE.latest('profiles')[1] or {}
     current_profile = profile_data.get(user, {})
     
     st.markdown("### 🌐 Platform Profiles")
@@ -734,14 +836,26 @@ with tab3:
     """, unsafe_allow_html=True)
 
     # --- Performance Charts ---
+    # Granularity follows the visible range so long histories stay light
+    chart_range = st.date_input("Chart range",
+                                value=[user_df['date'].min(), user_df['date'].max()],
+                                min_value=user_df['date'].min(),
+                                max_value=user_df['date'].max(),
+                                key=f"chart_range_tab3_{user}")
+    chart_start, chart_end = chart_range if len(chart_range) == 2 else (chart_range[0], user_df['date'].max())
+    granularity, chart_df = series_for(rollups, user, chart_start, chart_end)
+    if granularity != 'day':
+        st.caption(f"Showing {granularity}ly rollups for this range")
+    
     tab1, tab2 = st.tabs(["📈 Cumulative Progress", "📊 Daily Activity"])
     
     with tab1:
         try:
+            line_cols = ['leetcode_total', 'skillrack_total', 'codechef_total', 'hackerrank_total']
             fig = px.line(
-                user_df,
+                downsample_lines(chart_df, 'date', line_cols, point_budget),
                 x='date',
-                y=['leetcode_total', 'skillrack_total', 'codechef_total', 'hackerrank_total'],
+                y=line_cols,
                 color_discrete_sequence=['#ffa116', '#8a2be2', '#7b7b7b', '#2ec866'],
                 height=400,
                 labels={'value': 'Problems Solved', 'date': 'Date'}
@@ -762,17 +876,18 @@ with tab3:
     
     with tab2:
         try:
+            bar_cols = ['leetcode_daily_increase', 'skillrack_daily_increase',
+                        'codechef_daily_increase', 'hackerrank_daily_increase']
             fig = px.bar(
-                user_df,
+                downsample_bars(chart_df, 'date', bar_cols, point_budget),
                 x='date',
-                y=['leetcode_daily_increase', 'skillrack_daily_increase', 
-                   'codechef_daily_increase', 'hackerrank_daily_increase'],
+                y=bar_cols,
                 color_discrete_sequence=['#ffa116', '#8a2be2', '#7b7b7b', '#2ec866'],
                 height=400,
                 labels={'value': 'Problems Solved', 'date': 'Date'}
             )
             fig.update_layout(
-                title=f"{user}'s Daily Activity",
+                title=f"{user}'s {'Daily' if granularity == 'day' else granularity.capitalize() + 'ly'} Activity",
                 plot_bgcolor='black',
                 paper_bgcolor='black',
                 barmode='stack',
@@ -813,12 +928,13 @@ with tab3:
     except Exception as e:
         st.error(f"Could not display recent activity: {str(e)}")
 
-with tab4:
+@st.fragment
+def render_raw_explorer():
     # Raw Data Explorer
     st.markdown("### 🔍 Raw Data Explorer")
     st.markdown("Explore and filter the complete dataset")
     
-    filtered_df = df.copy()
+    explorer = get_explorer_index(df, data_key)
     
     # Add filters
     cols = st.columns(3)
@@ -833,20 +949,31 @@ with tab4:
         platform_filter = st.multiselect("Filter by Platform Activity", 
                                       options=['leetcode', 'skillrack', 'codechef', 'hackerrank', 'github'])
     
-    # Apply filters
-    if user_filter:
-        filtered_df = filtered_df[filtered_df['user'].isin(user_filter)]
-    if date_range and len(date_range) == 2:
-        filtered_df = filtered_df[
-            (filtered_df['date'] >= pd.to_datetime(date_range[0])) & 
-            (filtered_df['date'] <= pd.to_datetime(date_range[1]))]
-    if platform_filter:
-        platform_cols = [f"{p}_daily_increase" for p in platform_filter]
-        filtered_df = filtered_df[filtered_df[platform_cols].sum(axis=1) > 0]
+    # Apply filters on the index (binary search on the sorted dates, per-user row lists)
+    start, end = (date_range[0], date_range[1]) if date_range and len(date_range) == 2 else (None, None)
+    rows = explorer.query(users=user_filter, start=start, end=end, active_platforms=platform_filter)
+    
+    # Server-side sorting and pagination: only the visible page is sent to the browser
+    sort_cols = st.columns([2, 1, 1, 1])
+    with sort_cols[0]:
+        sort_by = st.selectbox("Sort by", options=explorer.sortable_columns,
+                               index=explorer.sortable_columns.index('date'), key="explorer_sort_by")
+    with sort_cols[1]:
+        ascending = st.toggle("Ascending", value=False, key="explorer_ascending")
+    with sort_cols[2]:
+        page_size = st.selectbox("Rows per page", options=[25, 50, 100, 250], index=1, key="explorer_page_size")
+    page_count = max(1, -(-len(rows) // page_size))
+    with sort_cols[3]:
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1, key="explorer_page")
+    page = min(page, page_count)
+    
+    page_df = explorer.page(rows, page - 1, page_size, sort_by=sort_by, ascending=ascending)
+    first_row = (page - 1) * page_size + 1 if len(rows) else 0
+    st.caption(f"Rows {first_row}–{first_row + len(page_df) - 1 if len(rows) else 0} of {len(rows)} · page {page} of {page_count}")
     
     # Display data
     st.dataframe(
-        filtered_df,
+        page_df,
         column_config={
             "date": st.column_config.DateColumn("Date", format="YYYY-MM-DD"),
             "user": "Team Member",
@@ -865,19 +992,30 @@ with tab4:
         },
         hide_index=True,
         use_container_width=True,
-        height=600
+        height=min(len(page_df) * 35 + 38, 600)
     )
     
-    # Download button
-    csv = filtered_df.to_csv(index=False).encode('utf-8')
-    st.download_button(
-        label="Download filtered data as CSV",
-        data=csv,
-        file_name='filtered_coding_activity.csv',
-        mime='text/csv'
-    )
-    
-    # Data summary with improved visibility
+    # Download button; the full filtered CSV is only built on request
+    if st.button("Prepare filtered data as CSV", key="explorer_prepare_csv"):
+        csv = explorer.rows_frame(rows).to_csv(index=False).encode('utf-8')
+        st.download_button(
+            label="Download filtered data as CSV",
+            data=csv,
+            file_name='filtered_coding_activity.csv',
+            mime='text/csv'
+        )
+
+# Navigation: unlike st.tabs, only the selected view's data prep and rendering run
+VIEWS = {
+    "🏆 Leaderboard": render_leaderboard,
+    "📅 Weekly Summary": render_weekly_summary,
+    "📈 Individual Progress": render_individual_progress,
+    "🔍 Raw Data": render_raw_explorer,
+}
+view = st.radio("View", list(VIEWS), horizontal=True, key="view", label_visibility="collapsed")
+VIEWS[view]()
+
+# Data summary with improved visibility
 st.markdown("""
 <div style="background: white;
             padding: 1.5rem;
@@ -888,12 +1026,30 @@ st.markdown("""
     <div style="display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem;">
 """, unsafe_allow_html=True)
 
+# Team-wide numbers come from the scraper's team_daily series (one row per day);
+# the per-user history is only aggregated for days it does not cover yet
+team = load_team_series()
+try:
+    roster_size = len(load_profile_data(version))
+except BudgetExceeded:
+    roster_size = len(SHARED_CACHE.latest('profiles')[1] or {})
+latest_day = df['date'].max()
+team_members = df['user'].nunique()
+# Usable only if the whole current roster was recorded on the latest day (an intraday
+# run before the nightly one writes just the active members); df also holds members
+# who have since left the sheet, so it can't be the yardstick
+if (team is not None and not team.empty and team['date'].iloc[-1] == latest_day
+        and int(team['members'].iloc[-1]) >= roster_size):
+    team_solved = int(team['total_solved'].iloc[-1])
+else:
+    team_solved = int(df.groupby('user').last()['total_solved'].sum())
+
 # Custom metric cards with improved visibility
 metric_data = [
-    ("Team Members", df['user'].nunique(), "#6a11cb", "👥"),
+    ("Team Members", team_members, "#6a11cb", "👥"),
     ("Total Records", len(df), "#2575fc", "📝"),
-    ("Date Range", f"{df['date'].min().date()} to {df['date'].max().date()}", "#9c27b0", "📅"),
-    ("Total Solutions", int(df.groupby('user').last()['total_solved'].sum()), "#2ecc71", "✅")
+    ("Date Range", f"{df['date'].min().date()} to {latest_day.date()}", "#9c27b0", "📅"),
+    ("Total Solutions", team_solved, "#2ecc71", "✅")
 ]
 
 for label, value, color, icon in metric_data:
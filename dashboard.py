@@ -5,6 +5,12 @@ import pandas as pd
 from datetime import datetime, timedelta
 import plotly.express as px
 import json 
+import time
+from history_store import load_history, read_data_version, DASHBOARD_FIELDS
+from shared_cache import SharedCache
+from live_updates import HistoryListener, upsert_rows, LIVE_CHECK_SECONDS
+from firestore_meter import FirestoreMeter, BudgetExceeded, metered_client
+from downsample import downsample_lines, downsample_bars, DEFAULT_POINT_BUDGET
 
 st.set_page_config(page_title="Coding Team Tracker", page_icon="📊", layout="wide")
 
@@ -34,34 +40,81 @@ if not firebase_admin._apps:
     cred = credentials.Certificate(firebase_key_dict)
     firebase_admin.initialize_app(cred)
 
-# ✅ Now define Firestore client
-db = firestore.client()
+# ✅ Now define Firestore client, metered per session (FIRESTORE_READ_BUDGET caps its reads)
+if 'firestore_meter' not in st.session_state:
+    st.session_state.firestore_meter = FirestoreMeter()
+meter = st.session_state.firestore_meter
+db = metered_client(firestore.client(), meter)
+
+# The shared listener's reads belong to the process, not to whichever session started it
+@st.cache_resource
+def get_process_meter():
+    return FirestoreMeter(read_budget=0, write_budget=0)
 
 st.title("📊 Coding Team Daily & Weekly Tracker")
 
 # ————— Load Data —————
-@st.cache_data
-def load_data():
-    rows = []
+# Shared with dash.py and other replicas, keyed by the scraper's data version
+SHARED_CACHE = SharedCache.from_env()
+
+# Snapshot listeners push new versions and freshly written rows to this process
+@st.cache_resource
+def get_listener():
+    listener_db = metered_client(firestore.client(), get_process_meter())
+    return HistoryListener(listener_db, fields=DASHBOARD_FIELDS).start()
+
+# Polled only while the listener has not (or could not) report a version
+@st.cache_data(ttl=60)
+def get_data_version():
+    version = read_data_version(db)
+    return version if version is not None else f"h{int(time.time() // 3600)}"
+
+@st.cache_data(max_entries=2)
+def load_data(version):
     try:
-        users_iter = db.collection('users').list_documents()
-        users = list(users_iter)
-        print(f"Number of users found: {len(users)}")
-        if not users:
+        df = SHARED_CACHE.get_or_compute('history', version, load_history, db, DASHBOARD_FIELDS)
+        print(f"Number of users found: {df['user'].nunique() if not df.empty else 0}")
+        print(f"📈 Firestore usage this session: {meter.summary()}")
+        if df.empty:
             st.warning("No users found in Firestore.")
-        for u in users:
-            user_id = u.id
-            docs = u.collection('daily_totals').stream()
-            for doc in docs:
-                d = doc.to_dict()
-                d['user'] = user_id
-                rows.append(d)
+    except BudgetExceeded:
+        raise  # must not be cached as an empty frame
     except Exception as e:
         st.error(f"Error fetching Firestore data: {e}")
         return pd.DataFrame()
-    return pd.DataFrame(rows)
+    return df
+
+listener = get_listener()
+version, live_token, live_rows = listener.snapshot()
+over_budget = False
+try:
+    if version is None:
+        version = get_data_version()
+    df = upsert_rows(load_data(version), live_rows)
+except BudgetExceeded as e:
+    # Out of reads for this session: serve whatever the fleet loaded last
+    over_budget = True
+    version, df = SHARED_CACHE.latest('history')
+    if df is None:
+        st.error(f"⚠ {e} and no cached data is available yet.")
+        st.stop()
+    st.warning(f"⚠ {e}; showing cached data from version {version}.")
+
+# Reruns the page as soon as the listener has something newer than what is shown
+@st.fragment(run_every=LIVE_CHECK_SECONDS)
+def watch_for_updates():
+    latest, latest_token, _ = listener.snapshot()
+    if (latest if latest is not None else version, latest_token) != (version, live_token):
+        st.rerun()
+
+if not over_budget:
+    watch_for_updates()
+
+with st.sidebar.expander("🔧 Firestore usage"):
+    st.metric("Reads this session", meter.reads, help=f"{meter.read_bytes / 1024:.1f} KB")
+    st.metric("Writes this session", meter.writes, help=f"{meter.write_bytes / 1024:.1f} KB")
+    st.caption(f"Live listener (whole process): {get_process_meter().summary()}")
 
-df = load_data()
 if df.empty:
     st.warning("⚠ No data found in Firestore. Run the scraper first.")
     st.stop()
@@ -133,21 +186,23 @@ user_df['total_solved'] = (
     + user_df.get('hackerrank_total',0)
 )
 
-# Trend line chart
+# Trend line chart (LTTB-downsampled so long histories stay light)
+trend_cols = ['leetcode_total','skillrack_total','codechef_total','hackerrank_total','github_repos','total_solved']
 fig_trend = px.line(
-    user_df,
+    downsample_lines(user_df, 'date', trend_cols, DEFAULT_POINT_BUDGET),
     x='date',
-    y=['leetcode_total','skillrack_total','codechef_total','hackerrank_total','github_repos','total_solved'],
+    y=trend_cols,
     markers=True,
     title=f"Daily Totals for {user}"
 )
 st.plotly_chart(fig_trend, use_container_width=True)
 
-# Daily increase bar chart
+# Daily increase bar chart (bucketed sums beyond the point budget)
+inc_cols = ['leetcode_daily_increase','skillrack_daily_increase','codechef_daily_increase','hackerrank_daily_increase','github_daily_increase']
 fig_inc = px.bar(
-    user_df,
+    downsample_bars(user_df, 'date', inc_cols, DEFAULT_POINT_BUDGET),
     x='date',
-    y=['leetcode_daily_increase','skillrack_daily_increase','codechef_daily_increase','hackerrank_daily_increase','github_daily_increase'],
+    y=inc_cols,
     title=f"Daily Increase for {user}"
 )
 st.plotly_chart(fig_inc, use_container_width=True)
@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Points per series sent to the browser; override with CHART_POINT_BUDGET
+DEFAULT_POINT_BUDGET = int(os.getenv("CHART_POINT_BUDGET", "400"))
+
+
+def _numeric_x(x):
+    x = pd.Series(x)
+    if pd.api.types.is_datetime64_any_dtype(x):
+        return x.astype('int64').to_numpy(dtype=float)
+    return x.to_numpy(dtype=float)
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets: picks `threshold` row positions that keep
+    the visual shape of the (x, y) line. First and last points are always kept.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    picked = np.empty(threshold, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    bucket = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket) + 1
+        end = int((i + 1) * bucket) + 1
+        next_end = min(int((i + 2) * bucket) + 1, n)
+        # Average of the next bucket is the third triangle vertex
+        avg_x = x[end:next_end].mean() if next_end > end else x[-1]
+        avg_y = y[end:next_end].mean() if next_end > end else y[-1]
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        picked[i + 1] = a
+    return picked
+
+
+def downsample_lines(df, x, ys, budget=DEFAULT_POINT_BUDGET):
+    """
+    Rows to plot for a multi-series line chart: the union of each series' LTTB
+    picks, with the budget split across series so the total stays bounded.
+    """
+    if len(df) <= budget:
+        return df
+    df = df.sort_values(x)
+    xs = _numeric_x(df[x])
+    per_series = max(3, budget // max(1, len(ys)))
+    keep = set()
+    for col in ys:
+        keep.update(lttb_indices(xs, df[col].fillna(0).to_numpy(), per_series).tolist())
+    return df.iloc[sorted(keep)]
+
+
+def downsample_bars(df, x, ys, budget=DEFAULT_POINT_BUDGET, how='sum'):
+    """
+    At most `budget` bars: consecutive rows are bucketed and each bucket is
+    labelled with its first x. `how` is 'sum' (activity per bucket) or 'max'.
+    """
+    if len(df) <= budget:
+        return df
+    df = df.sort_values(x).reset_index(drop=True)
+    buckets = np.arange(len(df)) * budget // len(df)
+    grouped = df.groupby(buckets)
+    out = grouped[ys].agg(how)
+    out.insert(0, x, grouped[x].first())
+    return out.reset_index(drop=True)
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+
+class ExplorerIndex:
+    """
+    Row index for the Raw Data Explorer. The frame is stored sorted by date,
+    so date-range filters are two binary searches, per-user filters use each
+    user's own (date-sorted) row positions, and only the requested page of
+    rows is ever materialized.
+    """
+
+    def __init__(self, df):
+        self.frame = df.sort_values(['date', 'user'], kind='stable').reset_index(drop=True)
+        self.dates = self.frame['date'].to_numpy()
+        users = self.frame['user'].astype('category')
+        self.users = list(users.cat.categories)
+        codes = users.cat.codes.to_numpy()
+        self.user_rows = {user: np.flatnonzero(codes == code) for code, user in enumerate(self.users)}
+        self._ranks = {}
+        # List-valued fields (e.g. carried_forward) can't be ranked
+        self.sortable_columns = [c for c in self.frame.columns
+                                 if c == 'user' or pd.api.types.is_numeric_dtype(self.frame[c])
+                                 or pd.api.types.is_datetime64_any_dtype(self.frame[c])]
+
+    def _date_slice(self, rows, dates, start, end):
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side='left')
+        hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), side='right')
+        return rows[lo:hi]
+
+    def query(self, users=None, start=None, end=None, active_platforms=None):
+        """Positions (ascending, i.e. date order) of rows matching every filter."""
+        if users:
+            parts = [self._date_slice(self.user_rows[u], self.dates[self.user_rows[u]], start, end)
+                     for u in users if u in self.user_rows]
+            rows = np.sort(np.concatenate(parts)) if parts else np.array([], dtype=np.int64)
+        else:
+            rows = self._date_slice(np.arange(len(self.frame)), self.dates, start, end)
+        if active_platforms and len(rows):
+            cols = [f"{p}_daily_increase" for p in active_platforms]
+            rows = rows[self.frame[cols].to_numpy()[rows].sum(axis=1) > 0]
+        return rows
+
+    def _rank(self, column):
+        """Rank of every row by `column`, computed once per column."""
+        if column not in self._ranks:
+            order = np.argsort(self.frame[column].to_numpy(), kind='stable')
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            self._ranks[column] = rank
+        return self._ranks[column]
+
+    def page(self, rows, page, page_size, sort_by='date', ascending=True):
+        """The `page`-th (0-based) slice of `rows` sorted by `sort_by`, as a DataFrame."""
+        if sort_by != 'date':
+            rows = rows[np.argsort(self._rank(sort_by)[rows], kind='stable')]
+        if not ascending:
+            rows = rows[::-1]
+        start = page * page_size
+        return self.frame.iloc[rows[start:start + page_size]]
+
+    def rows_frame(self, rows):
+        return self.frame.iloc[rows]
@@ -0,0 +1,154 @@
+import json
+import os
+import threading
+
+from google.cloud.firestore_v1 import CollectionReference, DocumentReference, DocumentSnapshot, Query, WriteBatch
+
+# Per run (scraper) or per session (dashboards); 0 means unlimited
+READ_BUDGET = int(os.getenv("FIRESTORE_READ_BUDGET", "0"))
+WRITE_BUDGET = int(os.getenv("FIRESTORE_WRITE_BUDGET", "0"))
+
+READ_METHODS = {'get', 'stream', 'get_all', 'list_documents'}
+WRITE_METHODS = {'set', 'update', 'create', 'delete'}
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def _size(data):
+    """Rough document size; close enough to compare runs and sessions."""
+    return len(json.dumps(data, default=str)) if data else 0
+
+
+class FirestoreMeter:
+    """Read/write/byte counters for one scraper run or dashboard session, with an optional budget."""
+
+    def __init__(self, read_budget=READ_BUDGET, write_budget=WRITE_BUDGET):
+        self.read_budget = read_budget
+        self.write_budget = write_budget
+        self.reads = 0
+        self.writes = 0
+        self.read_bytes = 0
+        self.write_bytes = 0
+        self._lock = threading.Lock()
+
+    def check(self, kind):
+        if kind == 'read' and self.read_budget and self.reads >= self.read_budget:
+            raise BudgetExceeded(f"Firestore read budget of {self.read_budget} used up")
+        if kind == 'write' and self.write_budget and self.writes >= self.write_budget:
+            raise BudgetExceeded(f"Firestore write budget of {self.write_budget} used up")
+
+    def add_reads(self, count, nbytes=0):
+        with self._lock:
+            self.reads += count
+            self.read_bytes += nbytes
+
+    def add_writes(self, count, nbytes=0):
+        with self._lock:
+            self.writes += count
+            self.write_bytes += nbytes
+
+    def summary(self):
+        return (f"{self.reads} reads ({self.read_bytes / 1024:.1f} KB), "
+                f"{self.writes} writes ({self.write_bytes / 1024:.1f} KB)")
+
+
+def _unwrap(value):
+    if isinstance(value, Metered):
+        return value._target
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unwrap(v) for v in value)
+    return value
+
+
+def _snapshot_bytes(snap):
+    return _size(snap.to_dict()) if getattr(snap, 'exists', False) else 0
+
+
+class Metered:
+    """
+    Transparent wrapper around a Firestore client, reference, query or batch.
+    Calls that read or write are counted against the meter (and refused once
+    its budget is spent); references and queries they return stay wrapped.
+    """
+
+    def __init__(self, target, meter):
+        self._target = target
+        self._meter = meter
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            args = [_unwrap(a) for a in args]
+            kwargs = {k: _unwrap(v) for k, v in kwargs.items()}
+            if name in READ_METHODS:
+                self._meter.check('read')
+            elif name in WRITE_METHODS:
+                self._meter.check('write')
+            if name == 'on_snapshot':
+                args[0] = self._count_snapshots(args[0])
+            result = attr(*args, **kwargs)
+            if name in WRITE_METHODS:
+                self._count_write(args)
+            return self._wrap_result(name, result)
+        return call
+
+    def _count_write(self, args):
+        data = next((a for a in args if isinstance(a, dict)), None)
+        if isinstance(self._target, WriteBatch):
+            # Billed when the batch commits
+            self._pending = getattr(self, '_pending', []) + [_size(data)]
+        else:
+            self._meter.add_writes(1, _size(data))
+
+    def _count_snapshots(self, callback):
+        meter = self._meter
+
+        def counted(snapshots, changes, read_time):
+            # Listeners are billed per document delivered (initial results, then each change)
+            delivered = changes if changes else snapshots
+            meter.add_reads(len(delivered), sum(_snapshot_bytes(getattr(c, 'document', c)) for c in delivered))
+            return callback(snapshots, changes, read_time)
+        return counted
+
+    def _counted_stream(self, results, wrap):
+        count = 0
+        for item in results:
+            count += 1
+            self._meter.add_reads(1, _snapshot_bytes(item))
+            yield Metered(item, self._meter) if wrap else item
+        if count == 0 and isinstance(self._target, (Query, CollectionReference)):
+            self._meter.add_reads(1)  # an empty query still costs one read
+
+    def _wrap_result(self, name, result):
+        if name == 'commit' and isinstance(self._target, WriteBatch):
+            pending = getattr(self, '_pending', [])
+            self._meter.add_writes(len(pending), sum(pending))
+            self._pending = []
+        elif name == 'get' and isinstance(result, DocumentSnapshot):
+            self._meter.add_reads(1, _snapshot_bytes(result))
+        elif name == 'get' and isinstance(result, list):
+            self._meter.add_reads(max(1, len(result)), sum(_snapshot_bytes(s) for s in result))
+        elif name in ('stream', 'get_all', 'list_documents'):
+            return self._counted_stream(result, wrap=name == 'list_documents')
+        if isinstance(result, (DocumentReference, CollectionReference, Query, WriteBatch)):
+            return Metered(result, self._meter)
+        return result
+
+    def __eq__(self, other):
+        return self._target == _unwrap(other)
+
+    def __hash__(self):
+        return hash(self._target)
+
+    def __repr__(self):
+        return f"Metered({self._target!r})"
+
+
+def metered_client(client, meter=None):
+    """`client` wrapped so every call is counted against `meter` (a fresh one by default)."""
+    return Metered(client, meter or FirestoreMeter())
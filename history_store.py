@@ -0,0 +1,113 @@
+from datetime import date
+
+import pandas as pd
+from firebase_admin import firestore
+
+# Closed months are folded into users/{user}/monthly_totals/{YYYY-MM}: one
+# document per user-month with parallel arrays instead of ~30 day documents.
+MONTHLY_COLLECTION = 'monthly_totals'
+DAILY_COLLECTION = 'daily_totals'
+
+TOTAL_FIELDS = ['leetcode_total', 'skillrack_total', 'codechef_total', 'hackerrank_total', 'github_repos']
+HISTORY_FIELDS = TOTAL_FIELDS + [
+    'leetcode_daily_increase', 'skillrack_daily_increase', 'codechef_daily_increase',
+    'hackerrank_daily_increase', 'github_daily_increase',
+]
+# The dashboards recompute increases from totals on load, so their history
+# reads project down to the totals: stored increases and carried_forward
+# markers never leave the server.
+DASHBOARD_FIELDS = TOTAL_FIELDS
+
+
+def month_of(day):
+    return day[:7]
+
+
+def first_day_after(month):
+    """'2024-05' -> '2024-06-01'"""
+    year, mon = int(month[:4]), int(month[5:7])
+    year, mon = (year + 1, 1) if mon == 12 else (year, mon + 1)
+    return f"{year:04d}-{mon:02d}-01"
+
+
+def fold_month(month, rows):
+    """Columnar monthly document from a month's daily_totals dicts."""
+    rows = sorted(rows, key=lambda r: r['date'])
+    doc = {'month': month, 'dates': [r['date'] for r in rows]}
+    for field in HISTORY_FIELDS:
+        doc[field] = [int(r.get(field) or 0) for r in rows]
+    return doc
+
+
+def unfold_month(doc, fields=HISTORY_FIELDS):
+    """Inverse of fold_month: one dict per day, shaped like a daily_totals document."""
+    rows = []
+    for i, day in enumerate(doc.get('dates', [])):
+        row = {'date': day}
+        for field in fields:
+            values = doc.get(field) or []
+            row[field] = values[i] if i < len(values) else 0
+        rows.append(row)
+    return rows
+
+
+def load_user_history(user_ref, compacted_through=None, fields=None):
+    """
+    Rows for one user: compacted months plus only the raw days after them.
+    With `fields`, only those fields (and the date) are fetched.
+    """
+    rows = []
+    raw = user_ref.collection(DAILY_COLLECTION)
+    if fields is not None:
+        raw = raw.select(['date'] + list(fields))
+    if compacted_through:
+        months = user_ref.collection(MONTHLY_COLLECTION)
+        if fields is not None:
+            months = months.select(['dates'] + list(fields))
+        for doc in months.stream():
+            rows.extend(unfold_month(doc.to_dict(), fields if fields is not None else HISTORY_FIELDS))
+        raw = raw.where('date', '>=', first_day_after(compacted_through))
+    for doc in raw.stream():
+        rows.append(doc.to_dict())
+    for row in rows:
+        row['user'] = user_ref.id
+    return rows
+
+
+def load_history(db, fields=None):
+    """
+    Every user's history as one DataFrame (the raw daily_totals fields, or
+    just `fields`, plus `user`). Each user's `compacted_through` marker comes
+    from a single batched, projected read of the user documents.
+    """
+    user_refs = list(db.collection('users').list_documents())
+    markers = {}
+    if user_refs:
+        for snap in db.get_all(user_refs, field_paths=['compacted_through']):
+            if snap.exists:
+                markers[snap.id] = (snap.to_dict() or {}).get('compacted_through')
+    rows = []
+    for ref in user_refs:
+        rows.extend(load_user_history(ref, markers.get(ref.id), fields))
+    return pd.DataFrame(rows)
+
+
+def current_month(today=None):
+    return (today or date.today()).strftime("%Y-%m")
+
+
+# meta/data_version is bumped after every run that writes history; readers key
+# their caches on it so a fleet of dashboards reloads once per data change.
+META_COLLECTION = 'meta'
+DATA_VERSION_DOC = 'data_version'
+
+
+def bump_data_version(db):
+    db.collection(META_COLLECTION).document(DATA_VERSION_DOC).set(
+        {'version': firestore.Increment(1), 'updated_at': firestore.SERVER_TIMESTAMP}, merge=True)
+
+
+def read_data_version(db):
+    """Current data version, or None if no run has published one yet."""
+    snap = db.collection(META_COLLECTION).document(DATA_VERSION_DOC).get()
+    return (snap.to_dict() or {}).get('version') if snap.exists else None
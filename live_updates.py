@@ -0,0 +1,132 @@
+import hashlib
+import json
+import threading
+from datetime import date, timedelta
+from functools import partial
+
+import pandas as pd
+
+from history_store import DAILY_COLLECTION, META_COLLECTION, DATA_VERSION_DOC
+
+# How often an open dashboard checks the listener for news (no Firestore reads)
+LIVE_CHECK_SECONDS = 30
+
+
+def _recent_since():
+    # Only recent days change; older documents never need listening to
+    return (date.today() - timedelta(days=1)).isoformat()
+
+
+class HistoryListener:
+    """
+    Keeps a dashboard process current without polling Firestore. One snapshot
+    listener follows meta/data_version (bumped after every scraper run); another
+    follows recent daily_totals documents and buffers each row written after it
+    started, so they can be laid over the last full load until the next version
+    includes them. Documents that already existed are part of that full load,
+    so every replica buffers the same rows whenever it started.
+    """
+
+    def __init__(self, db, since=None, fields=None):
+        self.db = db
+        # Listeners can't project, so rows are trimmed to `fields` as they arrive
+        self.fields = fields
+        self.since = since or _recent_since()
+        self.data_version = None
+        self.started = False
+        self._rows = {}
+        self._lock = threading.Lock()
+        self._version_watch = None
+        self._rows_watch = None
+        # Each rows watch gets a generation; its first snapshot (everything that
+        # already exists, all reported as ADDED) is skipped, as are late callbacks
+        # from a watch that has been replaced
+        self._rows_generation = 0
+        self._primed_generation = None
+
+    def start(self):
+        try:
+            meta = self.db.collection(META_COLLECTION).document(DATA_VERSION_DOC)
+            self._version_watch = meta.on_snapshot(self._on_version)
+            self._watch_rows()
+            self.started = True
+        except Exception as e:
+            print(f"⚠ Live updates unavailable, falling back to polling: {e}")
+        return self
+
+    def _watch_rows(self):
+        with self._lock:
+            self._rows_generation += 1
+            generation = self._rows_generation
+        recent = self.db.collection_group(DAILY_COLLECTION).where('date', '>=', self.since)
+        self._rows_watch = recent.on_snapshot(partial(self._on_rows, generation))
+
+    def stop(self):
+        for watch in (self._version_watch, self._rows_watch):
+            if watch is not None:
+                watch.unsubscribe()
+        self._version_watch = self._rows_watch = None
+
+    def _on_version(self, snapshots, changes, read_time):
+        move_since = False
+        for snap in snapshots:
+            version = (snap.to_dict() or {}).get('version') if snap.exists else None
+            with self._lock:
+                if version == self.data_version:
+                    continue
+                if self.data_version is not None:
+                    # A new version's full load already contains every row buffered so far
+                    self._rows.clear()
+                    move_since = _recent_since() > self.since
+                self.data_version = version
+        if move_since and self._rows_watch is not None:
+            # Keep the watched set to recent days instead of everything since the process started
+            old_watch = self._rows_watch
+            self.since = _recent_since()
+            self._watch_rows()
+            old_watch.unsubscribe()
+
+    def _on_rows(self, generation, snapshots, changes, read_time):
+        with self._lock:
+            if generation != self._rows_generation:
+                return
+            if self._primed_generation != generation:
+                self._primed_generation = generation
+                return
+            for change in changes:
+                # Removals only come from compaction, which keeps the data
+                if change.type.name == 'REMOVED':
+                    continue
+                doc = change.document
+                row = doc.to_dict() or {}
+                if self.fields is not None:
+                    row = {k: v for k, v in row.items() if k == 'date' or k in self.fields}
+                row.setdefault('date', doc.id)
+                row['user'] = doc.reference.parent.parent.id
+                self._rows[(row['user'], row['date'])] = row
+
+    def snapshot(self):
+        """
+        (data_version, token, rows). The token fingerprints the buffered rows,
+        so replicas that saw the same writes agree on it; '' means none.
+        """
+        with self._lock:
+            rows = [self._rows[key] for key in sorted(self._rows)]
+            version = self.data_version
+        if not rows:
+            return version, '', rows
+        token = hashlib.sha1(json.dumps(rows, sort_keys=True, default=str).encode()).hexdigest()[:12]
+        return version, token, rows
+
+
+def upsert_rows(df, rows):
+    """`df` with `rows` (daily_totals dicts plus `user`) replacing any existing row for the same user and date."""
+    if not rows:
+        return df
+    live = pd.DataFrame(rows)
+    if 'date' in df.columns and pd.api.types.is_datetime64_any_dtype(df['date']):
+        live['date'] = pd.to_datetime(live['date'])
+    merged = pd.concat([df, live], ignore_index=True)
+    return (merged.drop_duplicates(['user', 'date'], keep='last')
+                  .sort_values(['user', 'date'])
+                  .reset_index(drop=True))
@@ -0,0 +1,97 @@
+import queue
+import threading
+import time
+
+_DONE = object()
+
+
+class Stage:
+    """
+    One pipeline step: `fn(item)` runs on `workers` threads and its return
+    value is handed to the next stage (returning None drops the item).
+    `maxsize` bounds the stage's input queue, so a slow stage pushes back
+    on the ones before it instead of buffering the whole run.
+    """
+
+    def __init__(self, name, fn, workers=1, maxsize=None):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.maxsize = 2 * workers if maxsize is None else maxsize
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _record(self, elapsed, ok):
+        with self._lock:
+            self.busy_seconds += elapsed
+            if ok:
+                self.processed += 1
+            else:
+                self.failed += 1
+
+
+class Pipeline:
+    """Stages connected by bounded queues, each stage with its own worker threads."""
+
+    def __init__(self, stages):
+        self.stages = stages
+
+    def _worker(self, stage, inbox, outbox, results, results_lock):
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                return
+            start = time.monotonic()
+            try:
+                out = stage.fn(item)
+                ok = True
+            except Exception as e:
+                print(f"❌ {stage.name} stage failed: {e}")
+                out, ok = None, False
+            stage._record(time.monotonic() - start, ok)
+            if out is None:
+                continue
+            if outbox is None:
+                with results_lock:
+                    results.append(out)
+            else:
+                outbox.put(out)
+
+    def run(self, items):
+        """Feeds `items` through every stage and returns what the last stage produced."""
+        queues = [queue.Queue(maxsize=stage.maxsize) for stage in self.stages]
+        results = []
+        results_lock = threading.Lock()
+        threads = []
+        for i, stage in enumerate(self.stages):
+            outbox = queues[i + 1] if i + 1 < len(self.stages) else None
+            stage_threads = [
+                threading.Thread(target=self._worker, args=(stage, queues[i], outbox, results, results_lock),
+                                 name=f"{stage.name}-{n}", daemon=True)
+                for n in range(stage.workers)
+            ]
+            for t in stage_threads:
+                t.start()
+            threads.append(stage_threads)
+
+        start = time.monotonic()
+        for item in items:
+            queues[0].put(item)
+
+        # Shut stages down in order: a stage is done once every worker upstream has exited
+        for i, stage in enumerate(self.stages):
+            for _ in range(stage.workers):
+                queues[i].put(_DONE)
+            for t in threads[i]:
+                t.join()
+
+        self.elapsed = time.monotonic() - start
+        return results
+
+    def report(self):
+        print(f"\n⏱ Pipeline finished in {self.elapsed:.1f}s")
+        for stage in self.stages:
+            print(f"   - {stage.name}: {stage.processed} ok, {stage.failed} failed, "
+                  f"{stage.busy_seconds:.1f}s busy across {stage.workers} worker(s)")
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+INCREASE_COLUMNS = [
+    'leetcode_daily_increase',
+    'skillrack_daily_increase',
+    'codechef_daily_increase',
+    'hackerrank_daily_increase',
+    'github_daily_increase',
+]
+
+
+class PrefixSumIndex:
+    """
+    Per-user cumulative sums of the daily increase columns over a dense
+    day grid. Any [start, end] total is prefix[end + 1] - prefix[start],
+    so range queries cost O(1) per user instead of a scan of the frame.
+    """
+
+    def __init__(self, df, columns=INCREASE_COLUMNS):
+        self.columns = [c for c in columns if c in df.columns]
+        self.start = pd.Timestamp(df['date'].min()).normalize()
+        self.end = pd.Timestamp(df['date'].max()).normalize()
+        self.users = np.array(sorted(df['user'].unique()))
+        days = pd.date_range(self.start, self.end, freq='D')
+
+        grid = (df.assign(date=pd.to_datetime(df['date']).dt.normalize())
+                  .pivot_table(index='user', columns='date', values=self.columns, aggfunc='sum', fill_value=0))
+        self.prefix = {}
+        for col in self.columns:
+            values = grid[col].reindex(index=self.users, columns=days, fill_value=0).to_numpy(dtype=np.int64)
+            prefix = np.zeros((len(self.users), len(days) + 1), dtype=np.int64)
+            np.cumsum(values, axis=1, out=prefix[:, 1:])
+            self.prefix[col] = prefix
+        self._row = {user: i for i, user in enumerate(self.users)}
+
+    def _bounds(self, start, end):
+        """Clamp [start, end] (inclusive dates) to prefix positions."""
+        n_days = (self.end - self.start).days + 1
+        lo = (pd.Timestamp(start).normalize() - self.start).days
+        hi = (pd.Timestamp(end).normalize() - self.start).days + 1
+        return min(max(lo, 0), n_days), min(max(hi, 0), n_days)
+
+    def range_total(self, col, start, end, user=None):
+        """Sum of `col` over [start, end] for one user, or the whole team when user is None."""
+        lo, hi = self._bounds(start, end)
+        if hi <= lo:
+            return 0
+        prefix = self.prefix[col]
+        if user is None:
+            return int(prefix[:, hi].sum() - prefix[:, lo].sum())
+        row = self._row.get(user)
+        return 0 if row is None else int(prefix[row, hi] - prefix[row, lo])
+
+    def window_totals(self, start, end):
+        """One row per user with each column summed over [start, end]."""
+        lo, hi = self._bounds(start, end)
+        hi = max(hi, lo)
+        out = pd.DataFrame({'user': self.users})
+        for col in self.columns:
+            out[col] = self.prefix[col][:, hi] - self.prefix[col][:, lo]
+        return out
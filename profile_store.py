@@ -0,0 +1,36 @@
+import json
+import os
+
+from roster import PLATFORMS
+
+# Every member's profile links in one document, so a dashboard loads them all with one read
+PROFILES_COLLECTION = 'meta'
+PROFILES_DOC = 'profiles'
+PROFILES_CACHE_FILE = os.path.join(".cache", "profiles.json")
+
+
+def profiles_from_roster(roster):
+    """{name: {"<platform>_url": url}} built from the normalized roster ("" where there is no profile)."""
+    return {entry.name: {f"{p}_url": entry.profile_url(p) for p in PLATFORMS} for entry in roster}
+
+
+def save_profiles(db, profiles, path=PROFILES_CACHE_FILE):
+    """Publishes the profile index to Firestore and keeps a local copy next to the roster cache."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(profiles, f, indent=2)
+    os.replace(tmp, path)
+    db.collection(PROFILES_COLLECTION).document(PROFILES_DOC).set({'profiles': profiles})
+
+
+def load_profiles(db, path=PROFILES_CACHE_FILE):
+    """User-keyed profile index from Firestore, or from the local copy if it isn't there."""
+    snap = db.collection(PROFILES_COLLECTION).document(PROFILES_DOC).get()
+    if snap.exists:
+        return (snap.to_dict() or {}).get('profiles', {})
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,48 @@
+import pandas as pd
+
+# Window for the "recent form" ranking
+FORM_DAYS = 7
+
+
+class RankHistory:
+    """
+    Every member's leaderboard position on every day, from one (date x user)
+    pivot: `by_total` ranks by total solved (last known total carried across
+    missing days), `by_form` by problems solved over the trailing FORM_DAYS.
+    Each is a date-indexed frame with one column per user; 1 is first place,
+    ties share the better place, and days before a member's first record are NaN.
+    """
+
+    def __init__(self, df, total='total_solved', increase='total_daily_increase', form_days=FORM_DAYS):
+        days = pd.date_range(df['date'].min().normalize(), df['date'].max().normalize(), freq='D')
+        daily = df.assign(date=df['date'].dt.normalize())
+        totals = daily.pivot_table(index='date', columns='user', values=total, aggfunc='last').reindex(days).ffill()
+        increases = (daily.pivot_table(index='date', columns='user', values=increase, aggfunc='sum')
+                          .reindex(days).fillna(0))
+        form = increases.rolling(form_days, min_periods=1).sum().where(totals.notna())
+
+        self.by_total = totals.rank(axis=1, method='min', ascending=False)
+        self.by_form = form.rank(axis=1, method='min', ascending=False)
+
+    def _ranks(self, by):
+        return self.by_total if by == 'total' else self.by_form
+
+    def movement(self, days=FORM_DAYS, by='total'):
+        """Places gained (positive) or lost per user between `days` ago and the latest day."""
+        ranks = self._ranks(by)
+        if len(ranks) <= days:
+            return pd.Series(dtype=float)
+        return (ranks.iloc[-1 - days] - ranks.iloc[-1]).dropna()
+
+    def biggest_climbers(self, n=3, days=FORM_DAYS, by='total'):
+        """Up to `n` (user, places gained) pairs for the members who climbed the most."""
+        moves = self.movement(days, by)
+        moves = moves[moves > 0].sort_values(ascending=False, kind='stable')
+        return [(user, int(places)) for user, places in moves.head(n).items()]
+
+    def long_frame(self, users, by='total'):
+        """date, user, rank rows for charting the selected users."""
+        ranks = self._ranks(by)[list(users)]
+        out = ranks.rename_axis(index='date', columns='user').stack().rename('rank').reset_index().dropna()
+        out['rank'] = out['rank'].astype(int)
+        return out
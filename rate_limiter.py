@@ -0,0 +1,243 @@
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# ————— DEFAULT HOST LIMITS —————
+# rate = steady requests/second, burst = bucket size,
+# concurrency starts at min_concurrency and grows towards max_concurrency.
+HOST_LIMITS = {
+    "api.github.com": {"rate": 2.0, "burst": 5, "min_concurrency": 1, "max_concurrency": 4},
+    "leetcode.com": {"rate": 1.0, "burst": 2, "min_concurrency": 1, "max_concurrency": 3},
+    "www.hackerrank.com": {"rate": 1.0, "burst": 2, "min_concurrency": 1, "max_concurrency": 3},
+    "www.codechef.com": {"rate": 0.5, "burst": 1, "min_concurrency": 1, "max_concurrency": 2},
+    "www.skillrack.com": {"rate": 0.5, "burst": 1, "min_concurrency": 1, "max_concurrency": 2},
+}
+DEFAULT_LIMIT = {"rate": 1.0, "burst": 2, "min_concurrency": 1, "max_concurrency": 2}
+
+# Don't sleep through a retry window longer than this; hand the response back instead
+MAX_RETRY_WAIT = 60
+
+
+class Throttled(requests.RequestException):
+    """A host is paused (or paced) for longer than the caller is willing to wait for a slot."""
+
+
+def outage_status(status):
+    """True for statuses that mean the host is failing or throttling us, not that the request was wrong."""
+    return status is not None and (status == 429 or status >= 500)
+
+
+def is_outage(exc):
+    """True if a requests error means the host timed out, was unreachable, throttled us or answered 5xx."""
+    if isinstance(exc, (requests.Timeout, requests.ConnectionError, Throttled)):
+        return True
+    response = getattr(exc, "response", None)
+    return response is not None and outage_status(response.status_code)
+
+
+def _retry_after_seconds(headers, now=None):
+    """
+    Works out how long a host asked us to wait, from `Retry-After`
+    (seconds or HTTP date) or GitHub-style `X-RateLimit-Reset` (epoch seconds).
+    Returns None when the headers don't say.
+    """
+    if not headers:
+        return None
+    now = time.time() if now is None else now
+
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - now)
+            except (TypeError, ValueError):
+                pass
+
+    reset = headers.get("X-RateLimit-Reset")
+    remaining = headers.get("X-RateLimit-Remaining")
+    if reset and remaining is not None and str(remaining).strip() == "0":
+        try:
+            return max(0.0, float(reset) - now)
+        except ValueError:
+            pass
+    return None
+
+
+class HostLimiter:
+    """
+    Token bucket plus an AIMD concurrency window for a single host.
+    Healthy responses grow the window by roughly one slot per window's worth
+    of requests; 429/403s and errors halve it and pause the host.
+    """
+
+    def __init__(self, host, rate, burst, min_concurrency=1, max_concurrency=4):
+        self.host = host
+        self.rate = float(rate)
+        self.base_rate = float(rate)
+        self.burst = float(burst)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(min_concurrency)
+
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        elapsed = now - self._last_refill
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def acquire(self, timeout=MAX_RETRY_WAIT):
+        """Takes a slot, waiting at most `timeout` seconds; raises Throttled rather than wait longer."""
+        with self._cond:
+            deadline = time.monotonic() + max(0.0, timeout)
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._in_flight >= int(self.concurrency):
+                    wait = deadline - now  # woken by release()
+                elif self._tokens < 1:
+                    wait = (1 - self._tokens) / self.rate
+                else:
+                    self._tokens -= 1
+                    self._in_flight += 1
+                    return
+                if wait <= 0 or now + wait > deadline:
+                    raise Throttled(f"{self.host} has no free slot within {timeout:.0f}s")
+                self._cond.wait(wait)
+
+    def release(self, status=None, headers=None):
+        with self._cond:
+            self._in_flight -= 1
+            if status in (429, 403) or status is None:
+                self._back_off(status, headers)
+            elif status < 500:
+                # Additive increase: +1 slot after a full window of healthy responses
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1 / self.concurrency)
+                self.rate = min(self.base_rate, self.rate * 1.1)
+            else:
+                self._back_off(status, headers)
+            self._pace_from_headers(headers)
+            self._cond.notify_all()
+
+    def _back_off(self, status, headers):
+        self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+        self.rate = max(self.base_rate / 8, self.rate / 2)
+        wait = _retry_after_seconds(headers)
+        if wait is None and status in (429, 403):
+            wait = 1 / self.rate
+        if wait:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + wait)
+            print(f"⚠ {self.host} throttled (status {status}), pausing {wait:.1f}s "
+                  f"(concurrency {int(self.concurrency)})")
+
+    def _pace_from_headers(self, headers):
+        """Spread whatever quota is left over the time until the window resets."""
+        if not headers:
+            return
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining = int(remaining)
+            window = float(reset) - time.time()
+        except ValueError:
+            return
+        if remaining <= 0:
+            if window > 0:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + window)
+        elif window > 0:
+            # Never pace slower than a back-off would; if the quota runs out first the host
+            # is blocked and callers get Throttled instead of holding a worker for minutes
+            self.rate = min(self.rate, max(remaining / window, self.base_rate / 8))
+
+    def blocked_for(self):
+        with self._cond:
+            return max(0.0, self._blocked_until - time.monotonic())
+
+
+class _Outcome:
+    def __init__(self):
+        self.status = None
+        self.headers = None
+
+    def record(self, status, headers=None):
+        self.status = status
+        # Playwright hands back a plain dict with lower-cased names
+        self.headers = CaseInsensitiveDict(headers or {})
+
+
+class RateLimiter:
+    """Keeps one HostLimiter per host and routes requests through it."""
+
+    def __init__(self, host_limits=None, default_limit=None):
+        self.host_limits = HOST_LIMITS if host_limits is None else host_limits
+        self.default_limit = DEFAULT_LIMIT if default_limit is None else default_limit
+        # Optional time.monotonic() deadline for the whole run; no slot is waited for past it
+        self.deadline = None
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def for_host(self, host):
+        with self._lock:
+            limiter = self._hosts.get(host)
+            if limiter is None:
+                limiter = HostLimiter(host, **self.host_limits.get(host, self.default_limit))
+                self._hosts[host] = limiter
+            return limiter
+
+    def _max_wait(self):
+        if self.deadline is None:
+            return MAX_RETRY_WAIT
+        return min(MAX_RETRY_WAIT, self.deadline - time.monotonic())
+
+    @contextmanager
+    def slot(self, url):
+        """
+        Hold a slot for `url`'s host while doing the request yourself
+        (e.g. a Playwright page load); call `.record(status, headers)` on the
+        yielded object so the limiter can adapt. Unrecorded slots count as errors.
+        Raises Throttled if no slot frees up within MAX_RETRY_WAIT (or before the deadline).
+        """
+        limiter = self.for_host(urlparse(url).netloc)
+        limiter.acquire(self._max_wait())
+        outcome = _Outcome()
+        try:
+            yield outcome
+        finally:
+            limiter.release(outcome.status, outcome.headers)
+
+    def request(self, method, url, max_retries=2, **kwargs):
+        """requests.request() with per-host throttling; retries short 429/403 pauses."""
+        limiter = self.for_host(urlparse(url).netloc)
+        for attempt in range(max_retries + 1):
+            with self.slot(url) as outcome:
+                r = requests.request(method, url, **kwargs)
+                outcome.record(r.status_code, r.headers)
+            if r.status_code not in (429, 403) or attempt == max_retries:
+                return r
+            # A 403 without rate-limit headers is a plain "forbidden", not worth retrying
+            if r.status_code == 403 and _retry_after_seconds(r.headers) is None:
+                return r
+            if limiter.blocked_for() > MAX_RETRY_WAIT:
+                return r
+        return r
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
@@ -1,31 +1,38 @@
 import gspread
 import pandas as pd
 from google.oauth2.service_account import Credentials
+from google.auth.transport.requests import AuthorizedSession
 import os
 import json
 
+CACHE_DIR = ".cache"
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files/{key}"
+
+def _load_credentials():
+    # Get credentials from environment variable
+    gsheets_cred_json = os.environ.get("GSHEETS_CREDENTIALS")
+    if not gsheets_cred_json:
+        raise ValueError("❌ GSHEETS_CREDENTIALS environment variable not found.")
+
+    # Convert JSON string to dictionary
+    creds_dict = json.loads(gsheets_cred_json)
+
+    # Define required scopes
+    scopes = [
+        "https://www.googleapis.com/auth/spreadsheets",
+        "https://www.googleapis.com/auth/drive"
+    ]
+
+    # Load credentials
+    return Credentials.from_service_account_info(creds_dict, scopes=scopes)
+
 def read_google_sheet(sheet_name, worksheet_index=0):
     """
     Reads data from a Google Sheet and returns a pandas DataFrame.
     Uses google-auth instead of deprecated oauth2client.
     """
     try:
-        # Get credentials from environment variable
-        gsheets_cred_json = os.environ.get("GSHEETS_CREDENTIALS")
-        if not gsheets_cred_json:
-            raise ValueError("❌ GSHEETS_CREDENTIALS environment variable not found.")
-
-        # Convert JSON string to dictionary
-        creds_dict = json.loads(gsheets_cred_json)
-
-        # Define required scopes
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-
-        # Load credentials
-        credentials = Credentials.from_service_account_info(creds_dict, scopes=scopes)
+        credentials = _load_credentials()
         client = gspread.authorize(credentials)
 
         print("✅ Connected to Google Sheets.")
@@ -45,6 +52,75 @@ def read_google_sheet(sheet_name, worksheet_index=0):
         print(f"Error: {e}")
         return None
 
+def _sheet_cache_path(sheet_key, worksheet_index):
+    return os.path.join(CACHE_DIR, f"sheet_{sheet_key}_{worksheet_index}.json")
+
+def _load_sheet_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def get_sheet_revision(credentials, sheet_key):
+    """
+    One Drive metadata call: the file's `version` bumps on every edit,
+    so it's enough to tell whether a cached copy is still current.
+    """
+    session = AuthorizedSession(credentials)
+    r = session.get(DRIVE_FILES_URL.format(key=sheet_key),
+                    params={"fields": "version,modifiedTime", "supportsAllDrives": "true"},
+                    timeout=10)
+    r.raise_for_status()
+    meta = r.json()
+    return f"{meta.get('version')}@{meta.get('modifiedTime')}"
+
+def read_google_sheet_cached(sheet_key, worksheet_index=0):
+    """
+    Like read_google_sheet, but opens the sheet by key and keeps a local
+    copy in CACHE_DIR. The copy is served as long as the sheet's Drive
+    revision is unchanged, so an unchanged roster costs a single metadata
+    request instead of a Drive search plus a full records fetch.
+    """
+    path = _sheet_cache_path(sheet_key, worksheet_index)
+    cached = _load_sheet_cache(path)
+
+    try:
+        credentials = _load_credentials()
+        try:
+            revision = get_sheet_revision(credentials, sheet_key)
+        except Exception as e:
+            if cached is not None:
+                print(f"⚠ Could not check sheet revision ({e}), using cached copy.")
+                return pd.DataFrame(cached["records"])
+            revision = None
+
+        if cached is not None and revision is not None and cached.get("revision") == revision:
+            print(f"✅ Sheet unchanged (revision {revision}), read {len(cached['records'])} cached rows.")
+            return pd.DataFrame(cached["records"])
+
+        client = gspread.authorize(credentials)
+        worksheet = client.open_by_key(sheet_key).get_worksheet(worksheet_index)
+        records = worksheet.get_all_records()
+        print(f"✅ Read {len(records)} rows from sheet {sheet_key}.")
+
+        if revision is not None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"revision": revision, "records": records}, f)
+            os.replace(tmp, path)
+
+        return pd.DataFrame(records)
+
+    except Exception as e:
+        print("❌ Failed to read Google Sheet.")
+        print(f"Error: {e}")
+        if cached is not None:
+            print("⚠ Falling back to cached copy.")
+            return pd.DataFrame(cached["records"])
+        return None
+
 # For local testing
 if __name__ == "__main__":
     SHEET_NAME = "coding_team_profiles"
@@ -0,0 +1,78 @@
+import pandas as pd
+
+TEAM = "__team__"
+
+TOTAL_COLUMNS = [
+    'leetcode_total', 'skillrack_total', 'codechef_total', 'hackerrank_total', 'github_repos', 'total_solved',
+]
+INCREASE_COLUMNS = [
+    'leetcode_daily_increase', 'skillrack_daily_increase', 'codechef_daily_increase',
+    'hackerrank_daily_increase', 'github_daily_increase', 'total_daily_increase',
+]
+
+# Pandas frequency per granularity; labels are period starts so charts line up
+GRANULARITIES = {'day': 'D', 'week': 'W-MON', 'month': 'MS'}
+# Most points a chart series should carry before we move to a coarser level
+MAX_CHART_POINTS = 180
+
+
+def _rollup(df, freq):
+    """Totals take the period's last value, increases are summed."""
+    totals = [c for c in TOTAL_COLUMNS if c in df.columns]
+    increases = [c for c in INCREASE_COLUMNS if c in df.columns]
+    agg = {**{c: 'last' for c in totals}, **{c: 'sum' for c in increases}}
+    grouper = pd.Grouper(key='date', freq=freq, label='left', closed='left')
+    return (df.sort_values('date')
+              .groupby(['user', grouper])
+              .agg(agg)
+              .reset_index())
+
+
+def build_rollups(df):
+    """
+    {granularity: frame} with one row per (user, period), plus TEAM rows
+    summing every member per period. Computed once per data load.
+    """
+    rollups = {}
+    for name, freq in GRANULARITIES.items():
+        per_user = df[['user', 'date'] + [c for c in TOTAL_COLUMNS + INCREASE_COLUMNS if c in df.columns]]
+        per_user = _rollup(per_user, freq) if name != 'day' else per_user.sort_values(['user', 'date'])
+        team = per_user.drop(columns='user').groupby('date').sum().reset_index()
+        team['user'] = TEAM
+        rollups[name] = pd.concat([per_user, team], ignore_index=True)
+    return rollups
+
+
+def pick_granularity(start, end, max_points=MAX_CHART_POINTS):
+    """Finest granularity that keeps [start, end] within max_points periods."""
+    days = (pd.Timestamp(end) - pd.Timestamp(start)).days + 1
+    if days <= max_points:
+        return 'day'
+    if days / 7 <= max_points:
+        return 'week'
+    return 'month'
+
+
+def series_for(rollups, user, start, end, max_points=MAX_CHART_POINTS):
+    """(granularity, frame) for `user` (or TEAM) over [start, end] at an automatically chosen level."""
+    granularity = pick_granularity(start, end, max_points)
+    return granularity, _window(rollups[granularity], user, granularity, start, end)
+
+
+def team_series_for(team, start, end, max_points=MAX_CHART_POINTS):
+    """Like series_for(rollups, TEAM, ...), but rolled up from the scraper's one-row-per-day team_daily frame."""
+    granularity = pick_granularity(start, end, max_points)
+    frame = team[['date'] + [c for c in TOTAL_COLUMNS + INCREASE_COLUMNS if c in team.columns]].assign(user=TEAM)
+    if granularity != 'day':
+        frame = _rollup(frame, GRANULARITIES[granularity])
+    return granularity, _window(frame, TEAM, granularity, start, end)
+
+
+def _window(frame, user, granularity, start, end):
+    start = pd.Timestamp(start)
+    if granularity == 'week':
+        start -= pd.Timedelta(days=start.weekday())
+    elif granularity == 'month':
+        start = start.replace(day=1)
+    mask = (frame['user'] == user) & (frame['date'] >= start) & (frame['date'] <= pd.Timestamp(end))
+    return frame[mask]
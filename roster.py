@@ -0,0 +1,262 @@
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+from read_google_sheet import read_google_sheet, read_google_sheet_cached
+
+SHEET_NAME = "coding_team_profiles"
+# Opening by key skips the Drive search and enables revision-checked caching
+SHEET_KEY = os.getenv("GSHEETS_SHEET_KEY", "")
+ROSTER_CACHE_FILE = os.path.join(".cache", "roster.json")
+
+PLATFORMS = ['leetcode', 'skillrack', 'codechef', 'hackerrank', 'github']
+
+# Sheet column for each roster field
+ROSTER_COLUMNS = {
+    'name': "Name",
+    'email': "Email IDd",
+    'leetcode': "LeetCode ID (eg: Gfz6n0WdOg or https://leetcode.com/u/Gfz6n0WdOg/)",
+    'skillrack': "Skillrack Profile URL",
+    'codechef': "CodeChef Profile URL",
+    'hackerrank': "Hackerrank Profile URL",
+    'github': "GitHub Profile URL",
+}
+
+PROFILE_URLS = {
+    'leetcode': "https://leetcode.com/u/{handle}/",
+    'codechef': "https://www.codechef.com/users/{handle}",
+    'hackerrank': "https://www.hackerrank.com/{handle}",
+    'github': "https://github.com/{handle}",
+}
+
+HANDLE_PATTERNS = {
+    'leetcode': re.compile(r"^[A-Za-z0-9_.@-]{1,40}$"),
+    'codechef': re.compile(r"^[A-Za-z0-9_.]{1,40}$"),
+    'hackerrank': re.compile(r"^[A-Za-z0-9_.-]{1,40}$"),
+    'github': re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9-]{0,38})$"),
+}
+
+URL_HOSTS = {
+    'leetcode': "leetcode.com",
+    'skillrack': "skillrack.com",
+    'codechef': "codechef.com",
+    'hackerrank': "hackerrank.com",
+    'github': "github.com",
+}
+
+# Profile URL paths per platform: the segments before the handle, () for a bare /<handle>
+PROFILE_PATHS = {
+    'leetcode': [("u",), ()],
+    'codechef': [("users",)],
+    'hackerrank': [("profile",), ()],
+    'github': [()],
+}
+
+# Top-level site sections that a bare /<handle> path must not be mistaken for
+SITE_SECTIONS = {
+    'leetcode': {"u", "profile", "problems", "problemset", "problem-list", "contest", "discuss", "explore",
+                 "study-plan", "studyplan", "submissions", "accounts", "tag", "company", "interview",
+                 "assessment", "store", "subscribe", "list", "playground", "support", "jobs"},
+    'codechef': set(),
+    'hackerrank': {"profile", "certificates", "certificate", "certify", "challenges", "domains", "contests",
+                   "dashboard", "skills-verification", "interview", "interview-preparation-kit", "jobs",
+                   "login", "signup", "auth", "blog", "work", "leaderboard", "settings", "products",
+                   "companies", "prepare", "tracks", "developers", "community", "about-us", "x"},
+    'github': {"features", "orgs", "organizations", "settings", "marketplace", "explore", "topics",
+               "collections", "login", "join", "signup", "about", "pricing", "sponsors", "notifications",
+               "pulls", "issues", "enterprise", "apps", "trending", "search", "site", "security",
+               "codespaces", "new", "users", "customer-stories", "readme", "events", "discussions"},
+}
+
+
+class InvalidHandle(ValueError):
+    pass
+
+
+def _clean(value):
+    if value is None:
+        return ""
+    value = str(value).strip()
+    return "" if value.lower() in ("", "nan", "none", "-", "na", "n/a") else value
+
+
+def extract_handle(platform, value):
+    """
+    Normalizes a sheet cell (profile URL or bare id) to the handle the
+    scraper for `platform` expects. SkillRack has no public username, so its
+    handle is the canonical profile URL. Returns "" for empty cells and
+    raises InvalidHandle for anything that can't be a profile.
+    """
+    value = _clean(value)
+    if not value:
+        return ""
+
+    looks_like_url = "/" in value or value.lower().startswith(("http", "www."))
+    if platform == 'skillrack':
+        return _skillrack_url(value)
+
+    if looks_like_url:
+        url = value if value.lower().startswith("http") else f"https://{value}"
+        parsed = urlparse(url)
+        if not _on_host(parsed, URL_HOSTS[platform]):
+            raise InvalidHandle(f"not a {platform} URL: {value}")
+        handle = _handle_from_path(platform, parsed.path)
+        if handle is None:
+            raise InvalidHandle(f"not a {platform} profile URL: {value}")
+        value = handle
+
+    value = value.lstrip("@") if platform != 'leetcode' else value
+    if not HANDLE_PATTERNS[platform].match(value):
+        raise InvalidHandle(f"invalid {platform} handle: {value}")
+    return value
+
+
+def _on_host(parsed, host):
+    """True if the URL is on `host` itself or its www. form (not a lookalike or other subdomain)."""
+    return (parsed.hostname or "").lower() in (host, f"www.{host}")
+
+
+def _handle_from_path(platform, path):
+    """The handle in a profile URL path such as /u/<handle>/, or None for any other page."""
+    segments = [s for s in path.split("/") if s]
+    for prefix in PROFILE_PATHS[platform]:
+        if len(segments) != len(prefix) + 1:
+            continue
+        if [s.lower() for s in segments[:-1]] != list(prefix):
+            continue
+        if not prefix and segments[0].lower() in SITE_SECTIONS[platform]:
+            continue
+        return segments[-1]
+    return None
+
+
+def _skillrack_url(value):
+    url = value if value.lower().startswith("http") else f"https://{value}"
+    parsed = urlparse(url)
+    if not _on_host(parsed, URL_HOSTS['skillrack']):
+        raise InvalidHandle(f"not a skillrack URL: {value}")
+    query = parse_qs(parsed.query)
+    if "resume.xhtml" in parsed.path and query.get("id") and query.get("key"):
+        return f"https://www.skillrack.com/faces/resume.xhtml?id={query['id'][0]}&key={query['key'][0]}"
+    m = re.search(r"/profile/(\d+)/([0-9a-fA-F]+)", parsed.path)
+    if m:
+        return f"http://www.skillrack.com/profile/{m.group(1)}/{m.group(2)}"
+    raise InvalidHandle(f"skillrack URL needs a profile id and key: {value}")
+
+
+@dataclass
+class RosterEntry:
+    name: str
+    email: str = ""
+    handles: Dict[str, str] = field(default_factory=dict)
+    invalid: Dict[str, str] = field(default_factory=dict)
+
+    def handle(self, platform) -> Optional[str]:
+        """Handle to scrape, "" when the member has no profile, None when the cell was invalid."""
+        if platform in self.invalid:
+            return None
+        return self.handles.get(platform, "")
+
+    def profile_url(self, platform) -> str:
+        handle = self.handles.get(platform)
+        if not handle:
+            return ""
+        if platform == 'skillrack':
+            return handle
+        return PROFILE_URLS[platform].format(handle=handle)
+
+    def to_dict(self):
+        return {'name': self.name, 'email': self.email, 'handles': self.handles, 'invalid': self.invalid}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d['name'], d.get('email', ""), dict(d.get('handles', {})), dict(d.get('invalid', {})))
+
+
+def normalize_roster(df) -> List[RosterEntry]:
+    """Builds RosterEntry objects from the sheet's DataFrame, validating every handle once."""
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    entries = {}
+    duplicates = set()
+    for _, row in df.iterrows():
+        # Names are Firestore document ids, so keep them exactly as typed
+        name = row.get(ROSTER_COLUMNS['name'])
+        if not _clean(name):
+            continue
+        entry = RosterEntry(name=str(name), email=_clean(row.get(ROSTER_COLUMNS['email'])))
+        for platform in PLATFORMS:
+            raw = row.get(ROSTER_COLUMNS[platform], "")
+            try:
+                entry.handles[platform] = extract_handle(platform, raw)
+            except InvalidHandle as e:
+                entry.invalid[platform] = str(e)
+        if entry.name in entries:
+            duplicates.add(entry.name)
+        # A re-submitted row replaces the earlier one: one member, one users/{name} document
+        entries[entry.name] = entry
+    if duplicates:
+        print(f"⚠ {len(duplicates)} names appear more than once, keeping each one's last row: "
+              f"{', '.join(sorted(duplicates))}")
+    return list(entries.values())
+
+
+def report_invalid(roster):
+    invalid = [(e.name, platform, reason) for e in roster for platform, reason in e.invalid.items()]
+    if not invalid:
+        print(f"✅ All handles valid for {len(roster)} roster entries")
+        return invalid
+    print(f"⚠ {len(invalid)} invalid roster entries (will not be scraped):")
+    for name, platform, reason in invalid:
+        print(f"   - {name}: {reason}")
+    return invalid
+
+
+def save_roster_cache(roster, path=ROSTER_CACHE_FILE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump([e.to_dict() for e in roster], f, indent=2)
+    os.replace(tmp, path)
+
+
+def load_roster_cache(path=ROSTER_CACHE_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [RosterEntry.from_dict(d) for d in json.load(f)]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+_roster_memo = {}
+
+
+def load_roster(sheet_name=SHEET_NAME, refresh=False):
+    """
+    Normalized roster for `sheet_name`, memoized per process. With
+    GSHEETS_SHEET_KEY set the sheet is opened by key and only re-downloaded
+    when its revision changes. The normalized copy is also written to
+    ROSTER_CACHE_FILE and served from there if the sheet can't be read.
+    """
+    if not refresh and sheet_name in _roster_memo:
+        return _roster_memo[sheet_name]
+
+    if SHEET_KEY:
+        df = read_google_sheet_cached(SHEET_KEY)
+    else:
+        df = read_google_sheet(sheet_name)
+    if df is None:
+        roster = load_roster_cache()
+        if roster is None:
+            raise RuntimeError(f"❌ Could not read '{sheet_name}' and no cached roster exists.")
+        print(f"⚠ Using cached roster ({len(roster)} entries) from {ROSTER_CACHE_FILE}")
+    else:
+        roster = normalize_roster(df)
+        save_roster_cache(roster)
+
+    report_invalid(roster)
+    _roster_memo[sheet_name] = roster
+    return roster
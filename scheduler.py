@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+import time
+
+DEFERRED_FILE = os.path.join(".cache", "deferred.json")
+
+# Platforms answered by a plain REST/GraphQL call vs. a full Playwright page load
+REST_PLATFORMS = ['leetcode', 'hackerrank', 'github']
+BROWSER_PLATFORMS = ['codechef', 'skillrack']
+
+# Starting estimates (seconds per profile); refined from observed timings during the run
+PLATFORM_COSTS = {
+    'leetcode': 1.5,
+    'hackerrank': 1.0,
+    'github': 0.5,
+    'codechef': 12.0,
+    'skillrack': 12.0,
+}
+
+
+def load_deferred(path=DEFERRED_FILE):
+    """
+    The previous run's report as (run date, {(user, platform): first date it
+    was deferred}); (None, {}) when there is no report.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return None, {}
+    items = {(item['user'], item['platform']): item['since'] for item in report.get('items', [])}
+    return report.get('date'), items
+
+
+class RunScheduler:
+    """
+    Keeps a run inside its time budget. Work is ordered most-stale first,
+    each platform call must fit its estimated cost in the time left, and
+    whatever doesn't fit is deferred to a follow-up run and reported.
+    """
+
+    def __init__(self, budget_seconds, costs=None, state_path=DEFERRED_FILE):
+        self.budget_seconds = budget_seconds
+        self.deadline = time.monotonic() + budget_seconds
+        self.costs = dict(PLATFORM_COSTS if costs is None else costs)
+        self.state_path = state_path
+        self.previous_date, self.previous = load_deferred(state_path)
+        self.deferred = {}
+        self._lock = threading.Lock()
+
+    def remaining(self):
+        return self.deadline - time.monotonic()
+
+    def try_start(self, platform):
+        """True if one `platform` call is expected to finish before the deadline."""
+        with self._lock:
+            return self.remaining() >= self.costs.get(platform, 1.0)
+
+    def record(self, platform, seconds):
+        with self._lock:
+            # Exponentially weighted so a few slow pages don't dominate
+            self.costs[platform] = 0.7 * self.costs.get(platform, seconds) + 0.3 * seconds
+
+    def defer(self, user, platform, today):
+        with self._lock:
+            self.deferred[(user, platform)] = self.previous.get((user, platform), today)
+
+    def staleness(self, user):
+        """Oldest date this user's data has been waiting on, or None if nothing is pending."""
+        dates = [since for (u, _), since in self.previous.items() if u == user]
+        return min(dates) if dates else None
+
+    def order(self, roster):
+        """Users with work left over from earlier runs first (oldest first), then sheet order."""
+        def key(entry):
+            since = self.staleness(entry.name)
+            return (since is None, since or "")
+        return sorted(roster, key=key)
+
+    def pending_platforms(self, user):
+        return [platform for (u, platform) in self.previous if u == user]
+
+    def save_report(self, today):
+        items = [{'user': user, 'platform': platform, 'since': since}
+                 for (user, platform), since in sorted(self.deferred.items())]
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({'date': today, 'items': items}, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+        if not items:
+            print(f"✅ All work finished within the {self.budget_seconds / 60:.0f} min budget")
+            return
+        print(f"⏳ Deferred {len(items)} profile scrapes to a follow-up run:")
+        for item in items:
+            print(f"   - {item['user']}: {item['platform']} (pending since {item['since']})")
@@ -0,0 +1,195 @@
+import os
+import pickle
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import redis
+except ImportError:  # only needed for a redis:// SHARED_CACHE_URL
+    redis = None
+
+# Where dashboards share loaded data: a directory (default), memory:// or redis://host:port/db
+SHARED_CACHE_URL = os.getenv("SHARED_CACHE_URL", os.path.join(".cache", "shared"))
+# How long a replica waits for another one that is already loading the same key
+FILL_WAIT_SECONDS = float(os.getenv("SHARED_CACHE_FILL_WAIT", "120"))
+
+
+class DiskBackend:
+    """
+    Entries as files in one directory, safe for several processes on the same
+    host (or a shared volume): writes go through a temp file and os.replace,
+    and add() relies on O_EXCL so only one process wins a key.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.root, re.sub(r'[^A-Za-z0-9_.@-]', '_', key))
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key, data):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def add(self, key, data, ttl):
+        """Set only if absent (entries older than ttl seconds count as absent)."""
+        path = self._path(key)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(path) < ttl:
+                        return False
+                    os.remove(path)  # left behind by a crashed process
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            return True
+        return False
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class MemoryBackend:
+    """In-process stand-in with the same interface, for a single replica or local runs."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or (entry[1] is not None and entry[1] < time.time()):
+                return None
+            return entry[0]
+
+    def set(self, key, data):
+        with self._lock:
+            self._data[key] = (data, None)
+
+    def add(self, key, data, ttl):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and (entry[1] is None or entry[1] >= time.time()):
+                return False
+            self._data[key] = (data, time.time() + ttl)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class RedisBackend:
+    """Network backend shared by replicas on different hosts."""
+
+    def __init__(self, url):
+        if redis is None:
+            raise ImportError("SHARED_CACHE_URL points at redis but the 'redis' package is not installed")
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def set(self, key, data):
+        self.client.set(key, data)
+
+    def add(self, key, data, ttl):
+        return bool(self.client.set(key, data, nx=True, ex=max(1, int(ttl))))
+
+    def delete(self, key):
+        self.client.delete(key)
+
+
+def backend_from_url(url=SHARED_CACHE_URL):
+    if url.startswith("redis://") or url.startswith("rediss://"):
+        return RedisBackend(url)
+    if url == "memory://":
+        return MemoryBackend()
+    return DiskBackend(url[len("file://"):] if url.startswith("file://") else url)
+
+
+class SharedCache:
+    """
+    Versioned get-or-compute over a backend shared by every dashboard replica.
+    Keys are "{name}@{version}", so a new data version is simply a miss; the
+    first replica to miss computes while the others wait for its result, and
+    the previous version of the entry is dropped once the new one is stored.
+    """
+
+    def __init__(self, backend, fill_wait=FILL_WAIT_SECONDS):
+        self.backend = backend
+        self.fill_wait = fill_wait
+
+    @classmethod
+    def from_env(cls):
+        return cls(backend_from_url())
+
+    def _load(self, key):
+        data = self.backend.get(key)
+        return None if data is None else pickle.loads(data)
+
+    @contextmanager
+    def _fill_lock(self, key):
+        """Yields True if this process should compute `key`, False if another replica stored it meanwhile."""
+        lock = f"{key}.lock"
+        deadline = time.time() + self.fill_wait
+        while not self.backend.add(lock, str(os.getpid()).encode(), ttl=self.fill_wait):
+            if self.backend.get(key) is not None:
+                yield False
+                return
+            if time.time() > deadline:
+                print(f"⚠ Timed out waiting for another replica to fill {key}, loading it here")
+                yield True
+                return
+            time.sleep(0.5)
+        try:
+            yield self.backend.get(key) is None
+        finally:
+            self.backend.delete(lock)
+
+    def get_or_compute(self, name, version, fn, *args, **kwargs):
+        key = f"{name}@{version}"
+        value = self._load(key)
+        if value is not None:
+            return value
+        with self._fill_lock(key) as leader:
+            if not leader:
+                return self._load(key)
+            value = fn(*args, **kwargs)
+            self.backend.set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+            current = f"{name}@current"
+            previous = self.backend.get(current)
+            self.backend.set(current, str(version).encode())
+            if previous is not None and previous.decode() != str(version):
+                self.backend.delete(f"{name}@{previous.decode()}")
+            return value
+
+    def latest(self, name):
+        """(version, value) of the most recently stored entry for `name`, or (None, None)."""
+        current = self.backend.get(f"{name}@current")
+        if current is None:
+            return None, None
+        version = current.decode()
+        return version, self._load(f"{name}@{version}")
@@ -0,0 +1,42 @@
+import threading
+
+
+class SingleFlight:
+    """
+    Runs each keyed call at most once. Concurrent callers with the same key
+    wait for the first one and share its result; later callers get the
+    memoized result. Meant to live for a single scrape run.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                return self._results[key]
+            event = self._in_flight.get(key)
+            leader = event is None
+            if leader:
+                event = threading.Event()
+                self._in_flight[key] = event
+
+        if not leader:
+            event.wait()
+            with self._lock:
+                self.hits += 1
+                return self._results.get(key)
+
+        result = None
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._results[key] = result
+                del self._in_flight[key]
+            event.set()
+        return result
@@ -0,0 +1,49 @@
+import pandas as pd
+from firebase_admin import firestore
+
+# team_daily/{date}: the whole team's numbers for one day, kept current by the
+# scraper with atomic increments in the same batch as each member's day.
+TEAM_COLLECTION = 'team_daily'
+
+INCREASE_FIELDS = {
+    'leetcode_total': 'leetcode_daily_increase',
+    'skillrack_total': 'skillrack_daily_increase',
+    'codechef_total': 'codechef_daily_increase',
+    'hackerrank_total': 'hackerrank_daily_increase',
+    'github_repos': 'github_daily_increase',
+}
+# total_solved leaves out GitHub repos, as on the dashboards
+SOLVED_FIELDS = ['leetcode_total', 'skillrack_total', 'codechef_total', 'hackerrank_total']
+
+
+def contribution(totals, baseline):
+    """One member's share of a team day, from their totals and the totals they are diffed against (None = no baseline)."""
+    share = {'members': 1}
+    for total_field, increase_field in INCREASE_FIELDS.items():
+        total = int(totals.get(total_field) or 0)
+        share[total_field] = total
+        share[increase_field] = total - int(baseline.get(total_field) or 0) if baseline is not None else 0
+    share['total_solved'] = sum(share[f] for f in SOLVED_FIELDS)
+    share['total_daily_increase'] = sum(share[INCREASE_FIELDS[f]] for f in SOLVED_FIELDS)
+    share['active_members'] = int(any(share[f] > 0 for f in INCREASE_FIELDS.values()))
+    return share
+
+
+def team_update(day, new_share, old_share=None):
+    """Merge payload moving team_daily/{day} from `old_share` (already counted) to `new_share`."""
+    update = {'date': day}
+    for field, value in new_share.items():
+        delta = value - (old_share or {}).get(field, 0)
+        if delta:
+            update[field] = firestore.Increment(delta)
+    return update
+
+
+def load_team_daily(db):
+    """One row per day (O(days) reads), sorted by date; empty if the scraper hasn't written any yet."""
+    rows = [doc.to_dict() for doc in db.collection(TEAM_COLLECTION).stream()]
+    if not rows:
+        return pd.DataFrame()
+    team = pd.DataFrame(rows)
+    team['date'] = pd.to_datetime(team['date'])
+    return team.sort_values('date').reset_index(drop=True)